@@ -0,0 +1,250 @@
+"""
+This module is the non-interactive way to run the prover, for servers
+and scripts. It never imports the menus or tkinter, and rule changes
+made on the command line only last as long as the run (Settings.json
+is left alone).
+
+Run it from the SequentProver directory, e.g.
+
+    python __main__.py inputs.txt more.txt -o trees.json \\
+        --rule "L&=Add" --structure Reflexivity=off --jobs 4
+
+Formats:
+    runs        {root: {key: sequent, ...}, ...}, like data/Runs
+    atoms       a sorted list of the atomic sequents in every tree
+                (put together from closures without building the
+                trees where every rule is invertible, permutation is
+                on and nothing is vetoed or limited, see
+                Objects.Closures)
+    counts      {root: {"nodes": n, "leaves": n, "derivations": n}}
+                (no trees are built, see Objects.Counts)
+
+With --checkpoints DIR, each tree being built is saved to DIR every
+minute and when interrupted, and running the same command again
+carries on from there (see Tree.populate and resume).
+
+Exit codes:
+    0   every tree was finished
+    1   some trees were left partial (--max-nodes, --max-seconds) or
+        skipped (--node-budget)
+    2   bad arguments or unreadable input
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from Controllers import Rules
+from Controllers.Caches import Cache
+from Controllers.ImportExport import Import
+from Controllers.Settings import Settings
+from Objects.Closures import Closures
+from Objects.Counts import TreeCounter
+from Objects.Estimates import estimate_sequent
+from Objects.Strategies import strategies
+from Objects.Trees import Tree, resume
+from Objects.Vetting import Vetter
+from Propositions.Converters import String
+
+OK, INCOMPLETE, ERROR = 0, 1, 2
+
+_modes = ("Add", "Mult")
+_structural_rules = ("Contraction", "Reflexivity", "Permutation")
+_switches = {"on": True, "off": False}
+_closures = Closures()   # per process, shared by every sequent it works on
+
+
+def parser() -> argparse.ArgumentParser:
+    batch = argparse.ArgumentParser(
+        prog="SequentProver",
+        description="Decompose the sequents in one or more input files "
+                    "without the menus.")
+    batch.add_argument("inputs", nargs="+", help="input files (.txt or .json)")
+    batch.add_argument("-o", "--output", required=True, help="output file")
+    batch.add_argument("-f", "--format", choices=("runs", "atoms", "counts"),
+                       default="runs")
+    batch.add_argument("--preset", choices=("Invertible", "NonInvertible"),
+                       help="start from a rule preset")
+    batch.add_argument("--rule", action="append", default=[], metavar="RULE=MODE",
+                       help="e.g. L&=Add (repeatable)")
+    batch.add_argument("--structure", action="append", default=[],
+                       metavar="RULE=on|off", help="e.g. Reflexivity=off (repeatable)")
+    batch.add_argument("--strategy", choices=list(strategies),
+                       help="principal strategy")
+    batch.add_argument("-j", "--jobs", type=int, default=1,
+                       help="number of worker processes")
+    batch.add_argument("--max-nodes", type=int, help="stop each tree at this many nodes")
+    batch.add_argument("--max-seconds", type=float, help="stop each tree after this long")
+    batch.add_argument("--node-budget", type=int,
+                       help="skip sequents estimated to exceed this many nodes")
+    batch.add_argument("--no-cache", action="store_true",
+                       help="neither read nor write the tree cache")
+    batch.add_argument("--checkpoints", metavar="DIR",
+                       help="save unfinished trees here and resume them")
+    return batch
+
+
+def main(arguments=None) -> int:
+    """Runs a batch and returns its exit code."""
+    batch = parser()
+    try:
+        options = batch.parse_args(arguments)
+        overrides = _overrides(options)
+    except SystemExit as exit_:
+        return exit_.code if isinstance(exit_.code, int) else ERROR
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return ERROR
+    configure(overrides)
+    try:
+        lines = [str(sequent) for file in options.inputs
+                 for sequent in Import(file).sequents()]
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return ERROR
+    limits = {"max_nodes": options.max_nodes, "max_seconds": options.max_seconds,
+              "node_budget": options.node_budget, "cache": not options.no_cache,
+              "checkpoints": options.checkpoints}
+    work = {"runs": _decompose, "atoms": _atoms, "counts": _count}[options.format]
+    if options.jobs > 1:
+        with ProcessPoolExecutor(options.jobs, initializer=configure,
+                                 initargs=(overrides,)) as pool:
+            results = list(pool.map(work, lines, [limits] * len(lines),
+                                    chunksize=max(len(lines) // (options.jobs * 4), 1)))
+    else:
+        results = [work(line, limits) for line in lines]
+    with open(options.output, "w") as file:
+        file.write(json.dumps(_format(results, options.format), indent=4))
+    incomplete = [root for root, _, status in results if status != "done"]
+    for root in incomplete:
+        print(f"Incomplete: {root}", file=sys.stderr)
+    return INCOMPLETE if incomplete else OK
+
+
+def configure(overrides: dict) -> None:
+    """Applies rule overrides to this process' settings without saving
+    them."""
+    if overrides["preset"]:
+        Rules.change_multiple("", overrides["preset"])
+    Settings()["Sequent Rules"].update(overrides["rules"])
+    Settings().dict.update(overrides["settings"])
+
+
+def _overrides(options) -> dict:
+    """Returns the rule and setting changes asked for."""
+    rules = {}
+    known = set(Rules.rules())
+    for override in options.rule:
+        rule, _, mode = override.partition("=")
+        if rule not in known or mode not in _modes:
+            raise ValueError(f"Invalid rule override: {override}")
+        rules[rule] = mode
+    settings = {}
+    for override in options.structure:
+        rule, _, switch = override.partition("=")
+        if rule not in _structural_rules or switch not in _switches:
+            raise ValueError(f"Invalid structural rule override: {override}")
+        settings[rule] = _switches[switch]
+    if options.strategy:
+        settings["Principal Strategy"] = options.strategy
+    return {"preset": options.preset, "rules": rules, "settings": settings}
+
+
+def _decompose(line: str, limits: dict) -> tuple:
+    """Returns (root, tree locations, status) for one sequent."""
+    tree, status = _tree(line, limits)
+    if tree is None:
+        return line, None, status
+    return line, {key: str(child) for key, child in tree.locations()}, status
+
+
+def _atoms(line: str, limits: dict) -> tuple:
+    """Returns (root, atomic sequents, status) for one sequent."""
+    leaves = _joined(line, limits)
+    if leaves is not None:
+        return line, sorted({str(leaf) for leaf in leaves}), "done"
+    tree, status = _tree(line, limits)
+    if tree is None:
+        return line, None, status
+    return line, sorted({str(child) for child in tree.values()
+                         if child.complexity == 0}), status
+
+
+def _joined(line: str, limits: dict):
+    """Returns the atomic leaves of one sequent's tree put together
+    from closures, or None if the tree has to be built (see atoms)."""
+    if any(limits[limit] is not None for limit in ("max_nodes", "max_seconds",
+                                                    "node_budget")):
+        return None
+    if Vetter():
+        return None
+    return _closures.joined(String(line).to_sequent(), exact=True)
+
+
+def _tree(line: str, limits: dict) -> tuple:
+    """Returns the tree of one sequent (None if skipped) and whether
+    it is done, partial or skipped."""
+    sequent = String(line).to_sequent()
+    budget = limits["node_budget"]
+    if budget is not None and estimate_sequent(sequent).nodes > budget:
+        return None, "skipped"
+    cache = Cache() if limits["cache"] else None
+    tree = cache.get(sequent) if cache else None
+    if tree is None:
+        vetter = Vetter()
+        vetoes = [vetter.veto] if vetter else []
+        checkpoint = _checkpoint(sequent, limits["checkpoints"])
+        tree = _resumed(checkpoint, vetoes)
+        if tree is None:
+            tree = Tree(sequent, vetoes=vetoes, factorise=True, share=True)
+        if limits["max_nodes"] is None and limits["max_seconds"] is None:
+            tree.populate(checkpoint=checkpoint)
+        else:
+            tree.expand(max_nodes=limits["max_nodes"],
+                        max_seconds=limits["max_seconds"])
+        if cache and not tree.is_partial:
+            cache.put(tree)
+    return tree, "partial" if tree.is_partial else "done"
+
+
+def _checkpoint(sequent, directory):
+    """Returns the file sequent's tree is checkpointed to with the
+    current settings (None without a checkpoint directory)."""
+    if directory is None:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    content = json.dumps([str(sequent), repr(Settings().fingerprint())])
+    name = hashlib.sha256(content.encode()).hexdigest()
+    return os.path.join(directory, f"{name}.json")
+
+
+def _resumed(checkpoint, vetoes):
+    """Returns the tree checkpointed to checkpoint, or None if there is
+    none or it can't be resumed (in which case the tree starts over)."""
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return None
+    try:
+        return resume(checkpoint, vetoes)
+    except (ValueError, KeyError):
+        return None
+
+
+def _count(line: str, limits: dict) -> tuple:
+    """Returns (root, counts, status) for one sequent."""
+    sequent = String(line).to_sequent()
+    vetter = Vetter()
+    counter = TreeCounter([vetter.veto] if vetter else [])
+    return line, counter.count(sequent)._asdict(), "done"
+
+
+def _format(results: list, output_format: str):
+    if output_format == "atoms":
+        atoms = set()
+        for _, result, _ in results:
+            if result is not None:
+                atoms.update(result)
+        return sorted(atoms)
+    return {root: result for root, result, _ in results if result is not None}
@@ -0,0 +1,164 @@
+"""
+This module keeps finished trees on disk so that decomposing a sequent
+that has already been decomposed under the same settings doesn't
+build its tree again.
+
+Each tree is stored in data/Cache under the SHA-256 of everything it
+depends on: the sequent, the rules (Settings().fingerprint()), the
+names in Names.json and the atoms rejected in Vetted.json. Changing
+any of them simply misses the old entries. Entries hold the tree's
+locations as gzipped JSON.
+
+The cache is bounded by the "Cache Size" setting (in bytes, no bound
+if null). Reading an entry marks it as recently used and, once the
+cache grows past its bound, the least recently used entries are
+evicted first. A Cache keeps a running total of the size of the
+entries it has seen, so that the directory is only scanned when that
+total passes the bound. Several processes may share a directory: each
+entry is written to a temporary file of its own and moved into place
+in one step. A Cache counts its hits and misses for report(). Like the
+Prover, a Cache assumes the settings don't change while it's in use.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+from Controllers.Settings import Settings
+from Objects import Names, Vetting
+from Objects.Sequents import Sequent
+from Objects.Trees import Tree
+
+_current_dir = os.path.dirname(__file__)
+_cache_dir = os.path.join(_current_dir, "..", "data", "Cache")
+
+
+class Cache:
+
+    def __init__(self, directory=_cache_dir, max_size=None):
+        """max_size defaults to the "Cache Size" setting."""
+        self.directory = directory
+        if max_size is None:
+            max_size = Settings().get("Cache Size")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._context = None
+        self._size = None    # the entries' total size, as far as this Cache knows
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"Cache({self.directory}, {self.hits} hits, {self.misses} misses)"
+
+    def __contains__(self, sequent: Sequent) -> bool:
+        return os.path.exists(self._path(sequent))
+
+    def get(self, sequent: Sequent):
+        """Returns sequent's cached tree, or None if it isn't cached."""
+        path = self._path(sequent)
+        try:
+            with gzip.open(path, "rt") as file:
+                locations = json.load(file)
+        except (FileNotFoundError, EOFError, OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return Tree(locations['0000'], source=locations)
+
+    def put(self, tree: Tree) -> None:
+        """Stores a finished tree, then evicts entries if the cache has
+        grown too big."""
+        locations = {key: str(sequent) for key, sequent in tree.locations()}
+        path = self._path(tree.root)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as raw, gzip.open(raw, "wt") as file:
+                json.dump(locations, file, separators=(",", ":"))
+            size = os.path.getsize(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            _remove(temporary)
+            raise
+        if self.max_size is None:
+            return
+        if self._size is None:
+            self.evict()
+        else:
+            self._size += size
+            if self._size > self.max_size:
+                self.evict()
+
+    def evict(self) -> int:
+        """Removes the least recently used entries until the cache fits
+        in max_size. Returns the number of entries removed."""
+        if self.max_size is None:
+            return 0
+        entries = []
+        size = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):    # still being written
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:    # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            size += stat.st_size
+        removed = 0
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            if _remove(path):
+                removed += 1
+            size -= entry_size
+        self._size = size
+        return removed
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            _remove(os.path.join(self.directory, name))
+        self._size = 0
+
+    def report(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0
+        return f"Cache: {self.hits} of {lookups} trees reused ({rate:.0%})."
+
+    def key(self, sequent: Sequent) -> str:
+        """Returns the hash sequent's tree is cached under."""
+        if self._context is None:
+            self._context = _context()
+        content = json.dumps([str(sequent), self._context])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _path(self, sequent: Sequent) -> str:
+        return os.path.join(self.directory, self.key(sequent) + ".json.gz")
+
+
+def _remove(path: str) -> bool:
+    """Removes path unless another process already has. Returns
+    whether this call removed it."""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _context() -> list:
+    """Returns everything besides the sequent a tree depends on."""
+    try:
+        rejected = sorted(Vetting.load()["Rejected"])
+    except FileNotFoundError:
+        rejected = []
+    return [repr(Settings().fingerprint()), Names.load(), rejected]
+
+
+def clear_cache():
+    """Delete every cached tree."""
+    Cache().clear()
+    print("Cache cleared.")
@@ -1,18 +1,29 @@
 import json
 import os
+from functools import cached_property
 from typing import Iterator
 
 from Propositions.Converters import String
+from Controllers import Shards
+from Controllers.Pipeline import Pipeline
 from Controllers.Settings import Settings
 from Propositions.BaseClasses import Proposition
+from Objects.Counts import TreeCounter
+from Objects.Derivations import Derivations
+from Objects.Estimates import estimate_sequent
+from Objects.Provers import Prover
 from Objects.Sequents import Sequent
+from Objects.Strategies import strategies
 from Objects.Trees import Tree
+from Objects.Vetting import Vetter
 
 _current_path = os.path.dirname(__file__)
 
 
 class Import:
     def __init__(self, file_path):
+        if not file_path.endswith((".txt", ".json")):
+            raise ValueError(f"{file_path} is neither a .txt nor a .json file.")
         with open(file_path, "r") as file:
             if file_path.endswith(".txt"):
                 self.data = file.readlines()
@@ -47,21 +58,31 @@ def _contains_connective(string) -> bool:
 connectives = ["if", "and", "or", "not"]
 
 
+class _RunsFile:
+    """This session's runs file, looked up when it's used rather than
+    when this module is imported (the output file changes at startup)."""
+
+    def __get__(self, instance, owner):
+        return os.path.join(_current_path, "..", "data",
+                            "Runs", Settings()["Output File"])
+
+
 class Export:
-    runs_file = os.path.join(_current_path, "..", "data",
-                             "Runs", Settings()["Output File"])
+    runs_file = _RunsFile()
     atoms_file = os.path.join(_current_path, "..", "data", "Atoms.json")
 
     def __init__(self, data):
         self.data = data
 
-    def to_runs(self):
+    def to_runs(self, file_path=None):
+        if file_path is None:
+            file_path = self.runs_file
         str_forest = {}
         for tree in self.data:
             tree_dict = {str(key): str(sequent)
-                         for key, sequent in tree.items()}
+                         for key, sequent in tree.locations()}
             str_forest.update({str(tree.root): tree_dict})
-        with open(self.runs_file, "w") as file:
+        with open(file_path, "w") as file:
             file.write(json.dumps(str_forest, indent=4))
 
     def to_atoms(self):
@@ -72,23 +93,108 @@ class Export:
                                if sequent.complexity == 0]
             atoms.update(atomic_sequents)
         with open(self.atoms_file, "w") as file:
-            file.write(json.dumps(list(atoms), indent=4))
+            file.write(json.dumps(sorted(atoms), indent=4))
 
 
 class Decompose:
 
     def __init__(self, file_path):
         self.file_path: str = file_path
-        self.data: list = [sequent for sequent in Import(file_path).sequents()]
 
-    def sequents(self):
+    @cached_property
+    def data(self) -> list:
+        return [sequent for sequent in Import(self.file_path).sequents()]
+
+    def sequents(self, workers=None):
+        """Decomposes the input file into the runs and atoms files,
+        streaming each tree out as it's finished (see Pipeline)."""
+        pipeline = Pipeline(self.file_path, Export.runs_file, Export.atoms_file,
+                            workers=workers)
+        pipeline.run()
+        budget = Settings().get("Node Budget")
+        for line in pipeline.skipped:
+            print(f"Skipped (over node budget of {budget}): {line}")
+        print(pipeline.report())
+
+    def refresh(self, runs_file=None) -> list:
+        """Brings the trees in runs_file (by default this session's
+        runs file) up to date with the current rules, re-expanding only
+        the subtrees that depend on a rule that changed, and saves
+        them. Returns the number of sequents re-expanded per tree."""
+        if runs_file is None:
+            runs_file = Export.runs_file
+        vetter = Vetter()
         forest = []
-        for line in self.data:
-            tree = Tree(line)
-            tree.populate()
+        refreshed = []
+        for tree in Import(runs_file).trees():
+            tree.vetoes = [vetter.veto] if vetter else []
+            refreshed.append(len(tree.refresh()))
             forest.append(tree)
-        Export(forest).to_runs()
+        Export(forest).to_runs(runs_file)
         Export(forest).to_atoms()
+        return refreshed
+
+    def lint(self) -> list:
+        """Returns (sequent, estimate, is_over_budget) for each
+        sequent in the input file without decomposing any of them."""
+        budget = Settings().get("Node Budget")
+        report = []
+        for line in self.data:
+            estimate = estimate_sequent(line)
+            is_over_budget = budget is not None and estimate.nodes > budget
+            report.append((line, estimate, is_over_budget))
+        return report
+
+    def benchmark(self) -> dict:
+        """Returns the total number of nodes and atomic leaves in the
+        trees of the input file under each principal strategy. Sequents
+        over the node budget are left out."""
+        budget = Settings().get("Node Budget")
+        current = Settings().get("Principal Strategy", "Leftmost")
+        sequents = [line for line in self.data if budget is None
+                    or estimate_sequent(line).nodes <= budget]
+        results = {}
+        try:
+            for strategy in strategies:
+                Settings().dict["Principal Strategy"] = strategy
+                nodes = 0
+                leaves = 0
+                for sequent in sequents:
+                    tree = Tree(Sequent(sequent.ant, sequent.con))
+                    tree.populate()
+                    nodes += len(tree)
+                    leaves += len([s for s in tree.values() if s.complexity == 0])
+                results[strategy] = (nodes, leaves)
+        finally:
+            Settings().dict["Principal Strategy"] = current
+        return results
+
+    def cheapest(self, cost="nodes") -> list:
+        """Returns the cheapest derivation of each sequent in the input
+        file (see Derivations.cheapest) and writes them to the runs
+        file with "-cheapest" added to its name."""
+        forest = []
+        for line in self.data:
+            tree = Tree(line, factorise=True, share=True)
+            tree.populate()
+            forest.append(Derivations(tree).cheapest(cost))
+        root, extension = os.path.splitext(Export.runs_file)
+        Export(forest).to_runs(f"{root}-cheapest{extension}")
+        return forest
+
+    def counts(self) -> list:
+        """Returns (sequent, count) for each sequent in the input file
+        without building any trees. The counts are pruned by the same
+        vetoes as the trees sequents() builds."""
+        vetter = Vetter()
+        counter = TreeCounter([vetter.veto] if vetter else [])
+        return [(line, counter.count(line)) for line in self.data]
+
+    def derivability(self) -> list:
+        """Returns (sequent, verdict) for each sequent in the input
+        file, judged against the atoms in Atoms.json."""
+        prover = Prover()
+        return [(line, prover.prove(line)) for line in self.data]
 
 
 def _names_file_is_empty():
@@ -100,15 +206,127 @@ def _names_file_is_empty():
     return True
 
 
-def decompose_sequents():
+def decompose_sequents(shard=None):
+    """Decompose the input file. shard = (k, n) only decomposes shard k
+    of n into data/Shards, to be merged later (see Controllers.Shards)."""
     input_file = Settings()["Input File"]
     if _names_file_is_empty():
         raise ValueError("Names.json contains no names.")
     try:
-        Decompose(input_file).sequents()
+        if shard is None:
+            Decompose(input_file).sequents()
+        else:
+            run = os.path.splitext(Settings()["Output File"])[0]
+            Shards.decompose_shard(input_file, *shard, run)
     except FileNotFoundError:
         print("Input file could not be found at: \n"
               f"{input_file} \n"
               f"Please verify file name and location.")
     except ValueError as e:
         print(e)
+
+
+def refresh_run():
+    """Update this session's run to the current rules."""
+    input_file = Settings()["Input File"]
+    try:
+        refreshed = Decompose(input_file).refresh()
+    except FileNotFoundError:
+        print("There is no run to refresh yet. Please decompose sequents "
+              "first.")
+        return
+    print(Settings().separator)
+    print(f"Refreshed {len(refreshed)} trees, re-expanding "
+          f"{sum(refreshed)} subtrees.")
+
+
+def lint_sequents():
+    """Print the estimated size of every tree in the input file and
+    flag the ones over the node budget."""
+    input_file = Settings()["Input File"]
+    try:
+        report = Decompose(input_file).lint()
+    except FileNotFoundError:
+        print("Input file could not be found at: \n"
+              f"{input_file} \n"
+              f"Please verify file name and location.")
+        return
+    print(Settings().separator)
+    print(f"Estimated tree sizes (node budget: {Settings().get('Node Budget')}):")
+    for sequent, estimate, is_over_budget in report:
+        flag = "OVER" if is_over_budget else "  ok"
+        print(f"{flag} nodes <= {estimate.nodes}, leaves <= {estimate.leaves}, "
+              f"depth <= {estimate.depth} | {sequent}")
+
+
+def extract_cheapest():
+    """Save and print the smallest derivation (by node count) of every
+    sequent in the input file."""
+    input_file = Settings()["Input File"]
+    try:
+        forest = Decompose(input_file).cheapest()
+    except FileNotFoundError:
+        print("Input file could not be found at: \n"
+              f"{input_file} \n"
+              f"Please verify file name and location.")
+        return
+    print(Settings().separator)
+    for tree in forest:
+        print(f"Smallest derivation ({len(tree)} nodes): {tree.root}")
+        for key, sequent in sorted(tree.items()):
+            print(f"\t{key}: {sequent}")
+
+
+def count_trees():
+    """Print the exact size of every tree in the input file."""
+    input_file = Settings()["Input File"]
+    try:
+        results = Decompose(input_file).counts()
+    except FileNotFoundError:
+        print("Input file could not be found at: \n"
+              f"{input_file} \n"
+              f"Please verify file name and location.")
+        return
+    print(Settings().separator)
+    print("Tree sizes:")
+    for sequent, count in results:
+        print(f"nodes: {count.nodes}, atomic leaves: {count.leaves}, "
+              f"derivations: {count.derivations} | {sequent}")
+
+
+def benchmark_strategies():
+    """Print the size of the input file's trees under each principal
+    strategy."""
+    input_file = Settings()["Input File"]
+    try:
+        results = Decompose(input_file).benchmark()
+    except FileNotFoundError:
+        print("Input file could not be found at: \n"
+              f"{input_file} \n"
+              f"Please verify file name and location.")
+        return
+    print(Settings().separator)
+    print("Tree size by principal strategy:")
+    for strategy, (nodes, leaves) in results.items():
+        print(f"{strategy.ljust(20)} nodes: {nodes}, atomic leaves: {leaves}")
+
+
+def check_derivability():
+    """Print whether each sequent in the input file is derivable from
+    the atoms in Atoms.json, along with one derivation if it is."""
+    input_file = Settings()["Input File"]
+    try:
+        results = Decompose(input_file).derivability()
+    except FileNotFoundError:
+        print("Input file could not be found at: \n"
+              f"{input_file} \n"
+              f"Please verify file name and location.")
+        return
+    print(Settings().separator)
+    for sequent, verdict in results:
+        if verdict.is_derivable:
+            print(f"Derivable: {sequent}")
+            for key, child in sorted(verdict.witness.items()):
+                print(f"\t{key}: {child}")
+        else:
+            print(f"Not derivable: {sequent}")
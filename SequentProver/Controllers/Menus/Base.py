@@ -1,11 +1,14 @@
 import json
 import importlib
 from collections import namedtuple
-from os import system
+from os import path as os_path, system
 
 
 Option = namedtuple("Option", "label, command")
 
+# menu files compiled by _table, by path: (modification time, table)
+_tables = {}
+
 
 class Menu:   # Defines what we need to display and interact with the menu
     _separator = "=" * 78
@@ -69,14 +72,16 @@ class Menu:   # Defines what we need to display and interact with the menu
         Lambdas and strings use "" as the function source package.
         Strings have a "'second pair of single quotes'" around them
         because I'm using eval().
+
+        Each file is only read and compiled once (see _table), and a
+        function's package is only imported once it is chosen.
         """
-        with open(path, "r") as file:
-            option_dict = json.load(file)
         options = []
-        for label, contents in option_dict.items():
-            module = importlib.import_module(contents[0]) if contents[0] else None
-            function = getattr(module, contents[1]) if module else eval(contents[1])
-            options.append(Option(label, function))
+        for label, package, source in _table(path):
+            if package:
+                options.append(Option(label, Command(package, source)))
+            else:
+                options.append(Option(label, eval(source, {}, {"self": self})))
         self.extend(options)
 
     def extend(self, options):
@@ -129,3 +134,40 @@ class Menu:   # Defines what we need to display and interact with the menu
         if self.clear_after_print:
             self._clear()
         return result
+
+
+class Command:
+    """A function in a menu file, imported the first time it's called
+    so that opening a menu doesn't import everything it links to."""
+
+    def __init__(self, package: str, name: str):
+        self.package = package
+        self.name = name
+        self._function = None
+
+    def __repr__(self):
+        return f"Command({self.package}.{self.name})"
+
+    def __call__(self, *args, **kwargs):
+        if self._function is None:
+            module = importlib.import_module(self.package)
+            self._function = getattr(module, self.name)
+        return self._function(*args, **kwargs)
+
+
+def _table(path: str) -> list:
+    """Returns the options in a menu file as (label, package, source)
+    triples, where source is compiled code when package is "". The
+    table is kept until the file changes."""
+    modified = os_path.getmtime(path)
+    if path in _tables and _tables[path][0] == modified:
+        return _tables[path][1]
+    with open(path, "r") as file:
+        option_dict = json.load(file)
+    table = []
+    for label, (package, source) in option_dict.items():
+        if not package:
+            source = compile(source, path, "eval")
+        table.append((label, package, source))
+    _tables[path] = modified, table
+    return table
@@ -98,6 +98,16 @@ def change_structure():
         Rules.change_structure(rule)
 
 
+def change_strategy():
+    """Change principal strategy."""
+    menu_file = os.path.join(_data_dir, "Menus", "Change_PrincipalStrategy.json")
+    menu = Menu(file=menu_file)
+    Settings().print_rules()
+    strategy = menu.open()
+    if strategy:
+        Settings()["Principal Strategy"] = strategy
+
+
 def names_menu():
     """Handle menu for viewing/changing names."""
     menu_file = os.path.join(_data_dir, "Menus", "View_Names.json")
@@ -105,6 +115,13 @@ def names_menu():
     menu.open()
 
 
+def vetting_menu():
+    """Handle menu for viewing/vetting atoms."""
+    menu_file = os.path.join(_data_dir, "Menus", "Vet_Atoms.json")
+    menu = Menu(file=menu_file)
+    menu.open()
+
+
 def remove_name():
     """Remove selected name from Names.json."""
     names_file = os.path.join(_data_dir, "Names.json")
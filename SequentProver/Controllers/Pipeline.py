@@ -0,0 +1,239 @@
+"""
+This module decomposes an input file as a pipeline of three stages
+connected by bounded queues, so that reading, decomposing and writing
+overlap and no stage runs ahead of the others by more than a queue's
+worth of sequents:
+
+    reader      parses the input file line by line and leaves out the
+                sequents over the node budget
+    decompose   builds each tree in a pool of worker processes (reusing
+                the tree cache, see Controllers.Caches)
+    writer      appends each finished tree to the runs file as soon as
+                it and the trees before it are done, and collects atoms
+
+Only the trees in flight are held in memory, never the whole forest.
+What does grow with the input is small: the position of every distinct
+tree written (one entry per root, used to leave out repeated sequents
+and by Controllers.Shards) and the set of distinct atoms, which is
+added to the atoms file at the end. The runs file is the same as
+Export.to_runs would write for the whole forest, in input order. It is
+written to a temporary file beside it and only renamed into place once
+every tree is written, so a pipeline that fails leaves no partial runs
+file behind.
+
+Pipeline(input_file, runs_file, atoms_file).run() does all of this and
+returns the number of trees written. With shard=(k, n) it only takes
+the sequents in shard k of n (see shard_of and Controllers.Shards).
+"""
+
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from Controllers.Caches import Cache
+from Controllers.Settings import Settings
+from Objects.Estimates import estimate_sequent
+from Objects.Trees import Tree
+from Objects.Vetting import Vetter
+from Propositions.Converters import String
+
+_done = object()   # marks the end of a queue
+
+# per worker process, set up by _start
+_worker = {}
+
+
+class Pipeline:
+
+    def __init__(self, input_file, runs_file, atoms_file, workers=None,
+                 queue_size=16, cache=True, shard=None):
+        """workers defaults to the number of CPUs and queue_size bounds
+        both queues."""
+        self.input_file = input_file
+        self.runs_file = runs_file
+        self.atoms_file = atoms_file
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.cache = Cache() if cache else None
+        self.shard = shard
+        self.skipped = []
+        self.positions = {}   # root: its position among the input's sequents
+        self._stop = threading.Event()
+        self._error = None
+
+    def __repr__(self):
+        return f"Pipeline({self.input_file}, {self.workers} workers)"
+
+    def run(self) -> int:
+        """Decomposes the input file into the runs and atoms files.
+        Returns the number of trees written."""
+        file = open(self.input_file, "r")    # raises here, not in the reader
+        sequents = queue.Queue(self.queue_size)
+        trees = queue.Queue(self.queue_size)
+        settings = json.loads(json.dumps(Settings().dict))
+        reader = threading.Thread(target=self._read, args=(file, sequents))
+        written = []
+        writer = threading.Thread(target=self._write, args=(trees, written))
+        with ProcessPoolExecutor(self.workers, initializer=_start,
+                                 initargs=(settings, self.cache is not None)) as pool:
+            reader.start()
+            writer.start()
+            try:
+                self._decompose(pool, sequents, trees)
+            except BaseException as error:    # e.g. KeyboardInterrupt
+                self._fail(error)
+                while sequents.get() is not _done:    # lets the reader finish
+                    pass
+            finally:
+                trees.put(_done)
+                reader.join()
+                writer.join()
+                file.close()
+        if self._error is not None:
+            raise self._error
+        return written[0]
+
+    def report(self) -> str:
+        if self.cache is None:
+            return "Cache: not used."
+        return self.cache.report()
+
+    def _read(self, file, sequents: queue.Queue):
+        """Reader stage: puts each sequent to decompose on sequents."""
+        budget = Settings().get("Node Budget")
+        try:
+            lines = json.load(file) if self.input_file.endswith(".json") else file
+            position = -1
+            for line in lines:
+                if self._stop.is_set():
+                    return
+                if " |~ " not in line:
+                    continue
+                position += 1
+                sequent = String(line.strip("\n")).to_sequent()
+                string = str(sequent)
+                if self.shard and shard_of(string, self.shard[1]) != self.shard[0]:
+                    continue
+                if budget is not None and estimate_sequent(sequent).nodes > budget:
+                    self.skipped.append(string)
+                    continue
+                sequents.put((position, string))
+        except Exception as error:
+            self._fail(error)
+        finally:
+            sequents.put(_done)
+
+    def _decompose(self, pool, sequents: queue.Queue, trees: queue.Queue):
+        """Decompose stage: hands sequents to the pool and passes their
+        futures on, in order. Every stage reads its queue to the end,
+        even once the pipeline has stopped, so that none of them blocks
+        for good."""
+        while True:
+            item = sequents.get()
+            if item is _done:
+                return
+            if not self._stop.is_set():
+                position, sequent = item
+                trees.put((position, pool.submit(_decompose, sequent)))
+
+    def _write(self, trees: queue.Queue, written: list):
+        """Writer stage: streams finished trees into a temporary file
+        that replaces the runs file once the pipeline has succeeded."""
+        atoms = set()
+        count = 0
+        directory = os.path.dirname(os.path.abspath(self.runs_file))
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w") as file:
+                file.write("{")
+                while True:
+                    item = trees.get()
+                    if item is _done:
+                        break
+                    position, future = item
+                    if self._stop.is_set():
+                        future.cancel()
+                        continue
+                    root, locations, atomic, is_cached = future.result()
+                    self._count(is_cached)
+                    atoms.update(atomic)
+                    if root in self.positions:
+                        continue
+                    self.positions[root] = position
+                    write_entry(file, root, locations, count)
+                    count += 1
+                file.write("\n}" if count else "}")
+            if not self._stop.is_set():
+                _add_atoms(self.atoms_file, atoms)
+                os.replace(temporary, self.runs_file)
+        except Exception as error:
+            self._fail(error)
+            while trees.get() is not _done:
+                pass
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        written.append(count)
+
+    def _count(self, is_cached: bool):
+        if self.cache is None:
+            return
+        if is_cached:
+            self.cache.hits += 1
+        else:
+            self.cache.misses += 1
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+
+def shard_of(sequent: str, shards: int) -> int:
+    """Returns the shard a sequent (as a string) belongs to, the same
+    in every process and on every machine (unlike hash())."""
+    digest = hashlib.sha256(sequent.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def write_entry(file, root: str, locations: dict, count: int):
+    """Writes one tree into an open runs file, formatted as
+    Export.to_runs would. count is the number of trees before it."""
+    entry = json.dumps(locations, indent=4).replace("\n", "\n    ")
+    file.write(f'{"," if count else ""}\n    {json.dumps(root)}: {entry}')
+
+
+def _start(settings: dict, cache: bool):
+    """Sets up a worker process with the pipeline's settings."""
+    Settings().dict = settings
+    vetter = Vetter()
+    _worker["vetoes"] = [vetter.veto] if vetter else []
+    _worker["cache"] = Cache() if cache else None
+
+
+def _decompose(line: str) -> tuple:
+    """Returns (root, tree locations, atoms, whether the tree was
+    cached) for one sequent."""
+    sequent = String(line).to_sequent()
+    cache = _worker["cache"]
+    tree = cache.get(sequent) if cache else None
+    is_cached = tree is not None
+    if not is_cached:
+        tree = Tree(sequent, vetoes=_worker["vetoes"], factorise=True, share=True)
+        tree.populate()
+        if cache:
+            cache.put(tree)
+    locations = {str(key): str(child) for key, child in tree.locations()}
+    atoms = [str(child) for child in tree.values() if child.complexity == 0]
+    return str(tree.root), locations, atoms, is_cached
+
+
+def _add_atoms(atoms_file: str, atoms: set):
+    with open(atoms_file, "r") as file:
+        atoms = atoms | set(json.load(file))
+    with open(atoms_file, "w") as file:
+        file.write(json.dumps(sorted(atoms), indent=4))
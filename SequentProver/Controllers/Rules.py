@@ -16,10 +16,7 @@ def change_single(rule):
 
 
 def change_structure(rule):
-    if Settings()[rule] == "On":
-        Settings()[rule] = "Off"
-    elif Settings()[rule] == "Off":
-        Settings()[rule] = "On"
+    Settings()[rule] = not Settings().get(rule, False)
 
 
 def change_multiple(rule, mode):
@@ -0,0 +1,257 @@
+"""
+This module runs the prover as a long-lived local service, so that
+scripts sending many small queries don't pay for starting up and
+warming caches every time.
+
+The service listens on localhost for HTTP POST requests with a JSON
+body {"sequents": [...]} (a batch of sequent strings) and answers with
+one result per sequent, in order:
+
+    /decompose      {"sequent": ..., "tree": {key: sequent, ...}}
+    /count          {"sequent": ..., "nodes": n, "leaves": n,
+                     "derivations": n}
+    /derive         {"sequent": ..., "is_derivable": bool,
+                     "witness": {key: sequent, ...} or null}
+
+GET /status reports how warm the caches are. Requests are handled by a
+bounded pool of worker threads. Trees are built in a pool of worker
+processes, so that decompositions run in parallel rather than taking
+turns on the GIL, and they're shared through the tree cache (see
+Controllers.Caches). The most recently decomposed trees are also kept
+in the service itself (up to memo_size of them), so that asking for
+one again reads neither the pool nor the disk. Each worker thread
+counts and proves with its own TreeCounter and Prover, so that a long
+count or proof holds up no other request; the lock only guards the
+service's bookkeeping. Parsed sequents, counts and derivability
+verdicts are kept between requests for as long as the service runs,
+against the settings it was started with. Unexpected errors are
+answered with status 500.
+
+Run it from the SequentProver directory with:
+
+    python -m Controllers.Service --port 8765 --workers 4 --processes 4
+"""
+
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from Controllers.Caches import Cache
+from Controllers.Settings import Settings
+from Objects.Counts import TreeCounter
+from Objects.Provers import Prover, load_base
+from Objects.Trees import Tree
+from Objects.Vetting import Vetter
+from Propositions.Converters import String
+
+
+class Engine:
+    """The warm state the service answers requests from."""
+
+    def __init__(self, cache=None, processes=None, memo_size=256):
+        """processes is the number of worker processes building trees
+        (by default one per CPU) and memo_size the number of trees kept
+        in memory."""
+        self.cache = cache if cache is not None else Cache()
+        self.base = load_base()
+        vetter = Vetter()
+        self.vetoes = [vetter.veto] if vetter else []
+        self.requests = 0
+        self.memo_size = memo_size
+        self.memo = OrderedDict()   # sequent: tree locations, oldest first
+        self.memo_hits = 0
+        self.counters = []
+        self.provers = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        settings = json.loads(json.dumps(Settings().dict))
+        self.pool = ProcessPoolExecutor(processes, initializer=_start,
+                                        initargs=(self.cache.directory, settings))
+
+    def status(self) -> dict:
+        with self.lock:
+            return {"requests": self.requests,
+                    "parsed": parse.cache_info().currsize,
+                    "counted": sum(len(counter.memo) for counter in self.counters),
+                    "proved": sum(len(prover.table) for prover in self.provers),
+                    "memo_hits": self.memo_hits,
+                    "cache_hits": self.cache.hits,
+                    "cache_misses": self.cache.misses}
+
+    def decompose(self, string: str) -> dict:
+        sequent = str(parse(string))
+        with self.lock:
+            locations = self.memo.get(sequent)
+            if locations is not None:
+                self.memo.move_to_end(sequent)
+                self.memo_hits += 1
+        if locations is None:
+            locations, is_cached = self.pool.submit(_decompose, sequent).result()
+            with self.lock:
+                if is_cached:
+                    self.cache.hits += 1
+                else:
+                    self.cache.misses += 1
+                self.memo[sequent] = locations
+                self.memo.move_to_end(sequent)
+                while len(self.memo) > self.memo_size:
+                    self.memo.popitem(last=False)
+        return {"sequent": string, "tree": locations}
+
+    def count(self, string: str) -> dict:
+        count = self._counter().count(parse(string))
+        return {"sequent": string, **count._asdict()}
+
+    def derive(self, string: str) -> dict:
+        verdict = self._prover().prove(parse(string))
+        witness = _locations(verdict.witness) if verdict.is_derivable else None
+        return {"sequent": string, "is_derivable": verdict.is_derivable,
+                "witness": witness}
+
+    def _counter(self) -> TreeCounter:
+        """Returns this thread's TreeCounter."""
+        if not hasattr(self.local, "counter"):
+            self.local.counter = TreeCounter(self.vetoes)
+            with self.lock:
+                self.counters.append(self.local.counter)
+        return self.local.counter
+
+    def _prover(self) -> Prover:
+        """Returns this thread's Prover."""
+        if not hasattr(self.local, "prover"):
+            self.local.prover = Prover(self.base)
+            with self.lock:
+                self.provers.append(self.local.prover)
+        return self.local.prover
+
+    def served(self) -> None:
+        """Counts one more answered request."""
+        with self.lock:
+            self.requests += 1
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True)
+
+
+@lru_cache(maxsize=65536)
+def parse(string: str):
+    """Returns the sequent string stands for, parsing each string once."""
+    return String(string).to_sequent()
+
+
+def _locations(tree: Tree) -> dict:
+    return {key: str(sequent) for key, sequent in tree.locations()}
+
+
+# the tree cache and vetoes of each worker process, set up by _start
+_worker = {}
+
+
+def _start(directory: str, settings: dict):
+    """Sets up a worker process with the service's settings."""
+    Settings().dict = settings
+    vetter = Vetter()
+    _worker["vetoes"] = [vetter.veto] if vetter else []
+    _worker["cache"] = Cache(directory)
+
+
+def _decompose(string: str) -> tuple:
+    """Returns the locations of a sequent's tree and whether it was
+    cached, building and caching the tree if it wasn't."""
+    cache = _worker["cache"]
+    sequent = parse(string)
+    tree = cache.get(sequent)
+    is_cached = tree is not None
+    if not is_cached:
+        tree = Tree(sequent, vetoes=_worker["vetoes"], factorise=True, share=True)
+        tree.populate()
+        cache.put(tree)
+    return _locations(tree), is_cached
+
+
+class Server(HTTPServer):
+    """An HTTPServer handing its requests to a bounded thread pool."""
+
+    def __init__(self, address, engine: Engine, workers=4):
+        super().__init__(address, _Handler)
+        self.engine = engine
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+        self.engine.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    endpoints = ("decompose", "count", "derive")
+
+    def do_GET(self):
+        if self.path.strip("/") != "status":
+            return self._reply(404, {"error": f"Unknown path: {self.path}"})
+        self._reply(200, self.server.engine.status())
+
+    def do_POST(self):
+        endpoint = self.path.strip("/")
+        if endpoint not in self.endpoints:
+            return self._reply(404, {"error": f"Unknown path: {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            sequents = json.loads(self.rfile.read(length))["sequents"]
+            handle = getattr(self.server.engine, endpoint)
+            results = [handle(sequent) for sequent in sequents]
+        except (ValueError, KeyError, TypeError) as error:
+            return self._reply(400, {"error": str(error)})
+        except Exception as error:
+            self.server.handle_error(self.request, self.client_address)
+            return self._reply(500, {"error": f"{type(error).__name__}: {error}"})
+        self.server.engine.served()
+        self._reply(200, {"results": results})
+
+    def _reply(self, status: int, body: dict):
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=8765, workers=4, processes=None):
+    """Serve requests on localhost until interrupted."""
+    server = Server(("127.0.0.1", port), Engine(processes=processes), workers)
+    print(f"Serving on http://127.0.0.1:{server.server_port} "
+          f"with {workers} workers. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the prover as a local service.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--processes", type=int, help="default: one per CPU")
+    arguments = parser.parse_args()
+    serve(arguments.port, arguments.workers, arguments.processes)
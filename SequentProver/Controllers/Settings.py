@@ -1,8 +1,6 @@
 import json
 import os
-import tkinter as tk     # provides the functions for entering a new input file via a dialog box
 from datetime import datetime
-from tkinter import filedialog    # provides the functions for entering a new input file via a dialog box
 
 
 _current_dir = os.path.dirname(__file__)
@@ -28,11 +26,17 @@ class _Settings:     # Is the object that we operate on when we change the setti
     def __delitem__(self, key):
         del self.dict[key]
 
+    def get(self, item, default=None):
+        return self.dict.get(item, default)
+
     def update_output_file(self):    # function that writes the the output files in the "data/Runs" folder.
         now = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
         self["Output File"] = f"{now}.json"
 
     def update_input_file(self):     # function that allows one to enter a new file with input sequents
+        # tkinter is imported here so that headless use never needs it
+        import tkinter as tk     # provides the functions for entering a new input file via a dialog box
+        from tkinter import filedialog    # provides the functions for entering a new input file via a dialog box
         window = tk.Tk()
         window.withdraw()
         file_path = filedialog.askopenfilename()
@@ -47,13 +51,25 @@ class _Settings:     # Is the object that we operate on when we change the setti
 
     def get_rules(self):
         rules = {"Rules": [rule for rule in self.rules]}
-        for rule in ["Contraction", "Reflexivity"]:
-            if self.dict[rule]:
+        for rule in ["Contraction", "Reflexivity", "Permutation"]:
+            if self.dict.get(rule):
                 rules[rule] = "On"
             else:
                 rules[rule] = "Off"
         return rules
 
+    def fingerprint(self) -> tuple:
+        """Returns everything that decides how sequents decompose, in a
+        form that can be compared and hashed. The principal order only
+        counts under the "User Order" strategy (None otherwise, or if
+        it is the default)."""
+        rules = tuple(sorted(self['Sequent Rules'].items()))
+        structure = tuple(bool(self.dict.get(rule))
+                          for rule in ["Contraction", "Reflexivity", "Permutation"])
+        strategy = self.get("Principal Strategy", "Leftmost")
+        order = self.get("Principal Order") if strategy == "User Order" else None
+        return rules, structure, strategy, tuple(order) if order is not None else None
+
     def get_rule(self, symbol: str):
         return self['Sequent Rules'][symbol]
 
@@ -63,7 +79,9 @@ class _Settings:     # Is the object that we operate on when we change the setti
         print("Current Rules:")
         print(f'Connectives: {", ".join(rules["Rules"])}')
         print(f'Contraction: {rules["Contraction"]}, '
-              f'Reflexivity: {rules["Reflexivity"]}')
+              f'Reflexivity: {rules["Reflexivity"]}, '
+              f'Permutation: {rules["Permutation"]}')
+        print(f'Principal Strategy: {self.get("Principal Strategy", "Leftmost")}')
 
 
 settings = None
@@ -0,0 +1,192 @@
+"""
+This module splits decomposing an input file into shards that can run
+on separate machines, and merges the shards back into the same runs
+and atoms as decomposing the file in one go.
+
+Each sequent belongs to one of n shards by a stable hash of the sequent
+(see Pipeline.shard_of), so every machine given the same input file
+agrees on the split without talking to the others, and a sequent that
+occurs twice always lands in the same shard. Shard k of a run is
+written to data/Shards/<run>/:
+
+    runs-k.json         the shard's trees, as in data/Runs
+    atoms-k.json        the shard's atomic sequents
+    manifest-k.json     the number of shards, the settings the shard
+                        was decomposed with, a hash of the input file
+                        and the position of each tree in it (written
+                        last, so a shard without one is unfinished)
+
+Gather every shard of a run into one data/Shards/<run> and merge it.
+merge() refuses shards that are missing, unfinished, or decomposed with
+different settings or from different input files instead of leaving
+their trees or atoms out. The merged runs keep the input's order and
+are written to a temporary file that replaces the runs file in one
+step, and the atoms are added to the atoms file, deduplicated and
+sorted.
+
+From the SequentProver directory:
+
+    python -m Controllers.Shards decompose input.txt --shard 0/4 --run demo
+    python -m Controllers.Shards merge demo
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from Controllers.Pipeline import Pipeline, write_entry
+from Controllers.Settings import Settings
+
+_current_dir = os.path.dirname(__file__)
+_data_dir = os.path.join(_current_dir, "..", "data")
+_shards_dir = os.path.join(_data_dir, "Shards")
+_runs_dir = os.path.join(_data_dir, "Runs")
+_atoms_file = os.path.join(_data_dir, "Atoms.json")
+
+
+def shard_dir(run: str) -> str:
+    return os.path.join(_shards_dir, run)
+
+
+def decompose_shard(input_file: str, index: int, shards: int, run: str,
+                    workers=None, cache=True) -> Pipeline:
+    """Decomposes the sequents of input_file in shard index (counting
+    from 0) of shards into shard_dir(run). workers and cache are the
+    same as Pipeline's."""
+    if not 0 <= index < shards:
+        raise ValueError(f"There is no shard {index} of {shards}.")
+    directory = shard_dir(run)
+    os.makedirs(directory, exist_ok=True)
+    manifest = os.path.join(directory, f"manifest-{index}.json")
+    if os.path.exists(manifest):
+        os.remove(manifest)
+    atoms_file = os.path.join(directory, f"atoms-{index}.json")
+    with open(atoms_file, "w") as file:
+        file.write("[]")
+    pipeline = Pipeline(input_file, os.path.join(directory, f"runs-{index}.json"),
+                        atoms_file, workers=workers, cache=cache, shard=(index, shards))
+    pipeline.run()
+    _write(manifest, {"shard": index, "shards": shards,
+                      "settings": repr(Settings().fingerprint()),
+                      "input": _digest(input_file),
+                      "skipped": pipeline.skipped,
+                      "positions": pipeline.positions})
+    return pipeline
+
+
+def merge(run: str, runs_file=None, atoms_file=_atoms_file) -> int:
+    """Merges the shards of run into runs_file (by default data/Runs/
+    <run>.json) and atoms_file. Returns the number of trees merged."""
+    if runs_file is None:
+        runs_file = os.path.join(_runs_dir, f"{run}.json")
+    manifests = _manifests(run)
+    entries = []
+    for manifest in manifests:
+        with open(os.path.join(shard_dir(run), f"runs-{manifest['shard']}.json")) as file:
+            runs = json.load(file)
+        if set(runs) != set(manifest["positions"]):
+            raise ValueError(f"Shard {manifest['shard']} of {run} does not "
+                             f"match its manifest.")
+        entries.extend((manifest["positions"][root], root, locations)
+                       for root, locations in runs.items())
+    entries.sort(key=lambda entry: entry[0])
+    temporary = runs_file + ".tmp"
+    with open(temporary, "w") as file:
+        file.write("{")
+        for count, (_, root, locations) in enumerate(entries):
+            write_entry(file, root, locations, count)
+        file.write("\n}" if entries else "}")
+    os.replace(temporary, runs_file)
+    with open(atoms_file, "r") as file:
+        atoms = set(json.load(file))
+    for manifest in manifests:
+        with open(os.path.join(shard_dir(run), f"atoms-{manifest['shard']}.json")) as file:
+            atoms.update(json.load(file))
+    _write(atoms_file, sorted(atoms), indent=4)
+    return len(entries)
+
+
+def skipped(run: str) -> list:
+    """Returns the sequents every shard of run left out for being over
+    the node budget."""
+    return [sequent for manifest in _manifests(run) for sequent in manifest["skipped"]]
+
+
+def _manifests(run: str) -> list:
+    """Returns the manifests of run's shards in order, making sure that
+    they are all there and agree with each other."""
+    directory = shard_dir(run)
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"There are no shards of {run} in {_shards_dir}.")
+    manifests = {}
+    for name in os.listdir(directory):
+        if name.startswith("manifest-"):
+            with open(os.path.join(directory, name)) as file:
+                manifest = json.load(file)
+            manifests[manifest["shard"]] = manifest
+    if not manifests:
+        raise ValueError(f"No shard of {run} has finished.")
+    first = next(iter(manifests.values()))
+    for manifest in manifests.values():
+        if (manifest["shards"], manifest["settings"]) != (first["shards"], first["settings"]):
+            raise ValueError(f"The shards of {run} were decomposed with "
+                             f"different shard counts or settings.")
+        if manifest.get("input") != first.get("input"):
+            raise ValueError(f"The shards of {run} were decomposed from "
+                             f"different input files.")
+    missing = sorted(set(range(first["shards"])) - set(manifests))
+    if missing:
+        raise ValueError(f"Shards {missing} of {run} are missing or unfinished.")
+    return [manifests[index] for index in range(first["shards"])]
+
+
+def _write(path: str, data, indent=None):
+    """Writes data as JSON to path in one step (readers see either the
+    old file or the new one, never half of it)."""
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        file.write(json.dumps(data, indent=indent))
+    os.replace(temporary, path)
+
+
+def _digest(path: str) -> str:
+    """Returns a hash of the contents of the file at path."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _shard(argument: str) -> tuple:
+    """Parses "k/n" into (k, n)."""
+    index, _, shards = argument.partition("/")
+    try:
+        return int(index), int(shards)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected k/n, got {argument}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Decompose an input file in "
+                                                 "shards and merge them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    decompose = commands.add_parser("decompose", help="decompose one shard")
+    decompose.add_argument("input", help="input file (.txt or .json)")
+    decompose.add_argument("--shard", type=_shard, required=True, metavar="K/N",
+                           help="decompose shard K (from 0) of N")
+    decompose.add_argument("--run", required=True, help="name of the sharded run")
+    decompose.add_argument("--workers", type=int)
+    merging = commands.add_parser("merge", help="merge every shard of a run")
+    merging.add_argument("run", help="name of the sharded run")
+    merging.add_argument("--output", help="runs file (default data/Runs/<run>.json)")
+    arguments = parser.parse_args()
+    if arguments.command == "decompose":
+        shard = decompose_shard(arguments.input, *arguments.shard, arguments.run,
+                                arguments.workers)
+        print(f"Shard {arguments.shard[0]} of {arguments.shard[1]}: "
+              f"{len(shard.positions)} trees, {len(shard.skipped)} skipped.")
+    else:
+        trees = merge(arguments.run, arguments.output)
+        print(f"Merged {trees} trees.")
@@ -0,0 +1,134 @@
+"""
+This module decomposes the same sequents under every combination of
+Add and Mult for the six connective rules and compares the atoms each
+combination produces.
+
+The atoms under a sequent only depend on the rules of the connectives
+in it, so they are memoised by the sequent along with the modes of just
+those rules. A sub-sequent whose connectives all keep their modes
+between two configurations is therefore decomposed once for both, and
+atomic sequents and sequents without Add/Mult connectives once for all
+64 of them.
+
+Sweep(sequents).run() returns the atoms of each configuration.
+sweep_rules() does this for the input file, prints how many atoms each
+configuration produces and saves all of them next to the runs.
+"""
+
+import json
+import os
+from itertools import product
+
+from Controllers import Rules
+from Controllers.ImportExport import Import
+from Controllers.Settings import Settings
+from Objects.Estimates import rule_occurrences
+from Objects.Sequents import Sequent, is_reflexive
+from Objects.Vetting import Vetter
+
+_current_dir = os.path.dirname(__file__)
+_runs_dir = os.path.join(_current_dir, "..", "data", "Runs")
+
+modes = ("Add", "Mult")
+
+
+class Sweep:
+
+    def __init__(self, sequents, vetoes=()):
+        """vetoes are the same as Tree's."""
+        self.sequents = list(sequents)
+        self.vetoes = list(vetoes)
+        self.rules = sorted(Rules.rules())
+        self.memo = {}
+        self._occurrences = {}
+        self.hits = 0
+
+    def __repr__(self):
+        return f"Sweep({len(self.sequents)} sequents, {len(self.memo)} memoised)"
+
+    def configurations(self):
+        """Generates every combination of modes for the six rules."""
+        for combination in product(modes, repeat=len(self.rules)):
+            yield dict(zip(self.rules, combination))
+
+    def run(self) -> dict:
+        """Returns the atoms (as strings) produced by each
+        configuration, labelled as in label()."""
+        current = dict(Settings()["Sequent Rules"])
+        results = {}
+        try:
+            for configuration in self.configurations():
+                Settings()["Sequent Rules"].update(configuration)
+                atoms = set()
+                for sequent in self.sequents:
+                    # fresh copy: a sequent's principal holds on to its rule
+                    atoms.update(self.atoms(Sequent(sequent.ant, sequent.con)))
+                results[label(configuration)] = atoms
+        finally:
+            Settings()["Sequent Rules"].update(current)
+        return results
+
+    def atoms(self, sequent: Sequent) -> frozenset:
+        """Returns the atomic sequents in sequent's tree under the
+        current rules."""
+        key = sequent, self._relevant(sequent)
+        if key in self.memo:
+            self.hits += 1
+            return self.memo[key]
+        if not sequent.complexity:
+            result = frozenset([str(sequent)])
+        else:
+            result = set()
+            for dimension in sequent.decompose(self._vetoes()):
+                for child in dimension:
+                    if child is not None:
+                        result.update(self.atoms(child))
+            result = frozenset(result)
+        self.memo[key] = result
+        return result
+
+    def _relevant(self, sequent: Sequent) -> tuple:
+        """Returns the current modes of the rules sequent's tree
+        depends on."""
+        if sequent not in self._occurrences:
+            occurrences = set(rule_occurrences(sequent))
+            self._occurrences[sequent] = [r for r in self.rules if r in occurrences]
+        rules = Settings()["Sequent Rules"]
+        return tuple(rules[rule] for rule in self._occurrences[sequent])
+
+    def _vetoes(self) -> list:
+        """Returns the vetoes to prune children with (see Tree)."""
+        if not Settings()['Reflexivity']:
+            return self.vetoes + [is_reflexive]
+        return self.vetoes
+
+
+def label(configuration: dict) -> str:
+    return ", ".join(f"{rule}: {mode}" for rule, mode in configuration.items())
+
+
+def sweep_rules():
+    """Print the number of atoms the input file produces under each
+    rule configuration and save the atoms themselves."""
+    input_file = Settings()["Input File"]
+    try:
+        sequents = list(Import(input_file).sequents())
+    except FileNotFoundError:
+        print("Input file could not be found at: \n"
+              f"{input_file} \n"
+              f"Please verify file name and location.")
+        return
+    vetter = Vetter()
+    sweep = Sweep(sequents, [vetter.veto] if vetter else [])
+    results = sweep.run()
+    shared = set.intersection(*results.values()) if results else set()
+    print(Settings().separator)
+    print(f"Atoms per rule configuration ({len(shared)} shared by all, "
+          f"{sweep.hits} subtrees reused):")
+    for configuration, atoms in results.items():
+        print(f"{len(atoms):6d} ({len(atoms - shared):6d} not shared) | {configuration}")
+    root, extension = os.path.splitext(Settings()["Output File"])
+    report = os.path.join(_runs_dir, f"{root}-sweep{extension}")
+    with open(report, "w") as file:
+        file.write(json.dumps({configuration: sorted(atoms)
+                               for configuration, atoms in results.items()}, indent=4))
@@ -0,0 +1,187 @@
+"""
+This module indexes a base of atomic sequents so that it can be queried
+without scanning all of it.
+
+Each atomic sequent is stored as a set of literals, one per occurrence
+of an atom, tagged with the side of the turnstile it is on and with
+which occurrence it is (so A, A |~ B and A |~ B differ when Contraction
+is off, and inclusion below is inclusion of multisets). A SetTrie holds
+these sets as sorted paths, so
+
+    - a base sequent Γ' |~ Δ' with Γ' ⊆ Γ and Δ' ⊆ Δ (one that licenses
+      Γ |~ Δ under monotonicity) is a stored subset of Γ |~ Δ, and
+    - a base sequent extending Γ |~ Δ is a stored superset of it.
+
+Both queries only follow the branches of the trie that can still match,
+rather than visiting every stored sequent.
+
+BaseIndex(sequents) wraps a SetTrie with these queries and label(tree),
+which judges every leaf of a Tree at once. With monotonic=True, `in`
+asks whether a sequent is licensed rather than whether it is in the
+base, so a BaseIndex can be handed to a Prover or a Saturation as their
+base either way.
+"""
+
+from Objects.Sequents import Sequent
+from Objects.Trees import Tree
+
+_ANT, _CON = 0, 1
+
+
+class SetTrie:
+    """A trie of sets, each stored as the path of its sorted items."""
+
+    __slots__ = ["root", "_size"]
+
+    def __init__(self, sets=()):
+        self.root = _Node()
+        self._size = 0
+        for items in sets:
+            self.insert(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, items) -> bool:
+        node = self.root
+        for item in sorted(items):
+            node = node.children.get(item)
+            if node is None:
+                return False
+        return node.is_end
+
+    def insert(self, items) -> None:
+        """Adds items as a set."""
+        node = self.root
+        for item in sorted(items):
+            node = node.children.setdefault(item, _Node())
+        if not node.is_end:
+            node.is_end = True
+            self._size += 1
+
+    def has_subset(self, items) -> bool:
+        """Whether any stored set is a subset of items."""
+        return next(self.subsets(items), None) is not None
+
+    def subsets(self, items):
+        """Generates every stored set that is a subset of items."""
+        query = sorted(set(items))
+        pending = [(self.root, 0, ())]
+        while pending:
+            node, start, path = pending.pop()
+            if node.is_end:
+                yield path
+            for index in range(start, len(query)):
+                child = node.children.get(query[index])
+                if child is not None:
+                    pending.append((child, index + 1, path + (query[index],)))
+
+    def supersets(self, items):
+        """Generates every stored set that is a superset of items."""
+        query = sorted(set(items))
+        pending = [(self.root, 0, ())]
+        while pending:
+            node, matched, path = pending.pop()
+            if matched == len(query):
+                yield from _paths(node, path)
+                continue
+            for item, child in node.children.items():
+                if item == query[matched]:
+                    pending.append((child, matched + 1, path + (item,)))
+                elif item < query[matched]:
+                    pending.append((child, matched, path + (item,)))
+
+
+class BaseIndex:
+
+    def __init__(self, sequents=(), monotonic=False):
+        """sequents are atomic. With monotonic, a sequent counts as in
+        the base if any base sequent licenses it."""
+        self.monotonic = monotonic
+        self.trie = SetTrie()
+        for sequent in sequents:
+            self.add(sequent)
+
+    def __repr__(self):
+        return f"BaseIndex({len(self.trie)} sequents, monotonic={self.monotonic})"
+
+    def __len__(self) -> int:
+        return len(self.trie)
+
+    def __contains__(self, sequent: Sequent) -> bool:
+        if sequent.complexity:
+            return False
+        if self.monotonic:
+            return self.licenses(sequent)
+        return _literals(sequent) in self.trie
+
+    def add(self, sequent: Sequent) -> None:
+        """Adds an atomic sequent to the base."""
+        if sequent.complexity:
+            raise ValueError(f"{sequent} is not atomic.")
+        self.trie.insert(_literals(sequent))
+
+    def licenses(self, sequent: Sequent) -> bool:
+        """Whether a base sequent Γ' |~ Δ' with Γ' ⊆ Γ and Δ' ⊆ Δ exists
+        for sequent Γ |~ Δ."""
+        return self.trie.has_subset(_literals(sequent))
+
+    def licensing(self, sequent: Sequent) -> list:
+        """Returns the base sequents that license sequent."""
+        return [_sequent(path) for path in self.trie.subsets(_literals(sequent))]
+
+    def extending(self, sequent: Sequent) -> list:
+        """Returns the base sequents that sequent licenses, i.e. those
+        with sequent's antecedent and consequent as subsets."""
+        return [_sequent(path) for path in self.trie.supersets(_literals(sequent))]
+
+    def label(self, tree: Tree) -> dict:
+        """Returns whether each leaf of tree is in the base, by key."""
+        verdicts = {}
+        labels = {}
+        for key, sequent in tree.items():
+            if sequent.complexity:
+                continue
+            if sequent not in verdicts:
+                verdicts[sequent] = sequent in self
+            labels[key] = verdicts[sequent]
+        return labels
+
+
+class _Node:
+
+    __slots__ = ["children", "is_end"]
+
+    def __init__(self):
+        self.children = {}
+        self.is_end = False
+
+
+def _paths(node: _Node, path: tuple):
+    """Generates every stored set at or below node."""
+    pending = [(node, path)]
+    while pending:
+        node, path = pending.pop()
+        if node.is_end:
+            yield path
+        for item, child in node.children.items():
+            pending.append((child, path + (item,)))
+
+
+def _literals(sequent: Sequent) -> frozenset:
+    """Returns the side-tagged atoms of sequent, numbering repeated
+    atoms on the same side."""
+    literals = set()
+    occurrences = {}
+    for side, props in ((_ANT, sequent.ant), (_CON, sequent.con)):
+        for prop in props:
+            item = side, str(prop)
+            occurrences[item] = occurrences.get(item, -1) + 1
+            literals.add((*item, occurrences[item], prop))
+    return frozenset(literals)
+
+
+def _sequent(path: tuple) -> Sequent:
+    """Returns the sequent stored as path."""
+    return Sequent([prop for side, _, _, prop in path if side == _ANT],
+                   [prop for side, _, _, prop in path if side == _CON])
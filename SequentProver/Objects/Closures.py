@@ -0,0 +1,143 @@
+"""
+This module computes the atomic leaves of a sequent's decomposition
+tree without building the tree, as long as every rule it needs is
+invertible.
+
+An invertible rule decomposes its principal the same way whatever else
+is in the sequent: one-parent rules add one unit to the rest of the
+sequent, two-parent ones add each of their two units to a copy of it.
+The leaves of a sequent are therefore made by picking one leaf
+contribution of each of its propositions and putting them together,
+i.e. they are the product of what each proposition decomposes into on
+its own. That set of contributions (atomic units, unit(ant, con)) is
+the proposition's closure. Closures are computed once per proposition,
+side and set of rules, and shared between every sequent a Closures
+object is asked about.
+
+Closures.leaves(sequent) falls back to populating a Tree when:
+    - a rule the sequent needs is non-invertible or a quantifier rule,
+    - contraction is on (merging repeated propositions can make the
+      leaves smaller than the product), or
+    - there are vetoes other than reflexivity.
+With reflexivity off, the reflexive leaves are left out, which removes
+exactly the leaves under the subtrees Tree would prune.
+
+Atoms within each cedent of a leaf are ordered by the proposition they
+came from, so leaves are the same as Tree's when permutation is on and
+the same up to the order of their atoms otherwise.
+
+Closures.joined(sequent) only ever uses closures and returns None
+where leaves() would fall back (and, with exact, where the leaves would
+differ from Tree's in order). Controllers.Batch uses it to write the
+atoms of a batch without building its trees.
+"""
+
+from itertools import product
+
+from Controllers.Settings import Settings
+from Objects.Sequents import Sequent, principal
+from Objects.Trees import Tree
+from Propositions import Decomposables
+from Propositions.BaseClasses import Atom, Quantifier
+from Propositions.Decomposables import unit
+
+
+class Closures:
+
+    def __init__(self):
+        self.tables = {}    # rule fingerprint -> {(proposition, side): closure}
+
+    def __repr__(self):
+        return f"Closures({sum(len(t) for t in self.tables.values())} closures)"
+
+    def leaves(self, sequent: Sequent, vetoes=()) -> list:
+        """Returns the atomic leaves of sequent's decomposition tree."""
+        if not sequent.complexity:
+            return [sequent]
+        leaves = self.joined(sequent) if not vetoes else None
+        if leaves is None:
+            tree = Tree(sequent, vetoes=vetoes)
+            tree.populate()
+            return [leaf for leaf in tree.values() if not leaf.complexity]
+        return leaves
+
+    def joined(self, sequent: Sequent, exact=False):
+        """Returns the atomic leaves of sequent's decomposition tree
+        made from closures, or None if they can't be. With exact, also
+        None if permutation is off, where they would only be Tree's up
+        to the order of their atoms."""
+        if exact and not Settings().get("Permutation"):
+            return None
+        closures = self._closures(sequent)
+        if closures is None:
+            return None
+        leaves = [Sequent(ant, con) for ant, con in _join(closures)]
+        if not Settings()['Reflexivity']:
+            leaves = [leaf for leaf in leaves if not leaf.is_reflexive]
+        return leaves
+
+    def count_leaves(self, sequent: Sequent) -> int:
+        """Returns the number of atomic leaves of sequent's
+        decomposition tree."""
+        closures = self._closures(sequent) if sequent.complexity else None
+        if closures is None or not Settings()['Reflexivity']:
+            return len(self.leaves(sequent))
+        count = 1
+        for closure in closures:
+            count *= len(closure)
+        return count
+
+    def closure(self, proposition, side: str):
+        """Returns the atomic units proposition decomposes into on side
+        ("ant" or "con"), or None if that takes a rule that isn't
+        compositional."""
+        table = self.tables.setdefault(Settings().fingerprint(), {})
+        key = (proposition, side)
+        if key not in table:
+            table[key] = self._closure(proposition, side)
+        return table[key]
+
+    def _closures(self, sequent: Sequent):
+        """Returns the closure of every proposition in sequent, or None
+        if any of them isn't compositional."""
+        if Settings().get("Contraction"):
+            return None
+        closures = []
+        for side in ("ant", "con"):
+            for proposition in getattr(sequent, side):
+                closure = self.closure(proposition, side)
+                if closure is None:
+                    return None
+                closures.append(closure)
+        return closures
+
+    def _closure(self, proposition, side: str):
+        if isinstance(proposition, Atom):
+            if side == "ant":
+                return unit((proposition,), ()),
+            return unit((), (proposition,)),
+        if isinstance(proposition, Quantifier):
+            return None
+        decomposable = Decomposables.create(principal(side, 0, proposition))
+        if not decomposable.is_invertible:
+            return None
+        closure = []
+        for parts in decomposable.decompose():
+            closures = [self.closure(prop, "ant") for prop in parts.ant]
+            closures += [self.closure(prop, "con") for prop in parts.con]
+            if None in closures:
+                return None
+            closure.extend(unit(ant, con) for ant, con in _join(closures))
+        return tuple(closure)
+
+
+def _join(closures):
+    """Generates the (antecedent, consequent) made by each combination
+    of one unit from every closure."""
+    for units in product(*closures):
+        antecedent = ()
+        consequent = ()
+        for part in units:
+            antecedent += part.ant
+            consequent += part.con
+        yield antecedent, consequent
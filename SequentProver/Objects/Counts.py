@@ -0,0 +1,90 @@
+"""
+This module counts the size of a sequent's decomposition tree without
+building it.
+
+The tree under a sequent only depends on the sequent itself (and the
+rules), so its counts can be worked out once per distinct sub-sequent
+and reused everywhere that sub-sequent shows up:
+
+    nodes           1 + the nodes under each child
+    leaves          1 for an atomic sequent, else the leaves under
+                    each child
+    derivations     the number of ways to pick one cognate at every
+                    non-invertible step: the product of the children's
+                    derivations for an invertible sequent, the sum over
+                    cognates of that product for a non-invertible one,
+                    and 1 for an atomic sequent
+
+Children are found with Sequent.decompose(), pruned and collapsed the
+same way Tree.populate() does it, so nodes and leaves are the numbers
+len(tree) and its atomic sequents would give, and derivations matches
+Objects.Derivations. A cognate whose children were all pruned isn't in
+the tree and isn't counted as a choice.
+
+TreeCounter().count(sequent) returns a count. The memo assumes the
+rules don't change while the TreeCounter is in use.
+"""
+
+from collections import namedtuple
+
+from Controllers.Settings import Settings
+from Objects.Sequents import Sequent, is_reflexive
+
+count = namedtuple('count', 'nodes, leaves, derivations')
+
+
+class TreeCounter:
+
+    def __init__(self, vetoes=()):
+        """vetoes are the same as Tree's."""
+        self.vetoes = list(vetoes)
+        self.memo = {}
+
+    def __repr__(self):
+        return f"TreeCounter({len(self.memo)} sub-sequents)"
+
+    def count(self, sequent: Sequent) -> count:
+        """Returns the counts of sequent's decomposition tree."""
+        if sequent in self.memo:
+            return self.memo[sequent]
+        if not sequent.complexity:
+            result = count(1, 1, 1)
+        else:
+            result = self._count_children(sequent)
+        self.memo[sequent] = result
+        return result
+
+    def _count_children(self, sequent: Sequent) -> count:
+        nodes = 1
+        leaves = 0
+        choices = []
+        for dimension in cognates(sequent, self._vetoes()):
+            derivations = 1
+            for child in dimension:
+                if child is None:
+                    continue
+                counted = self.count(child)
+                nodes += counted.nodes
+                leaves += counted.leaves
+                derivations *= counted.derivations
+            if any(child is not None for child in dimension):
+                choices.append(derivations)
+        return count(nodes, leaves, sum(choices) if choices else 1)
+
+    def _vetoes(self) -> list:
+        """Returns the vetoes to prune children with (see Tree)."""
+        if not Settings()['Reflexivity']:
+            return self.vetoes + [is_reflexive]
+        return self.vetoes
+
+
+def cognates(sequent: Sequent, vetoes=()) -> list:
+    """Returns the dimensions of sequent's decomposition that its tree
+    keeps, i.e. all of them unless contraction or permutation is on and
+    a dimension repeats an earlier one. Pruned children are None."""
+    children = sequent.decompose(vetoes)
+    if sequent.principal.proposition.is_invertible:
+        return children[:1]
+    if not (Settings().get("Contraction") or Settings().get("Permutation")):
+        return children
+    return list(dict.fromkeys(children))
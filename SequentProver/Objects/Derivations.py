@@ -0,0 +1,144 @@
+"""
+This module lists the derivations in a decomposition tree, i.e. the
+subtrees made by picking one cognate at every non-invertible step, the
+way Display has the user pick them by hand.
+
+Derivations(tree) numbers a populated tree's derivations without
+building any of them. They are ordered by the cognate picked at the
+root (aaa, aab, ...), then by the derivations of that cognate's
+children, the leftmost child being the most significant. So
+
+    >>> derivations = Derivations(tree)
+    >>> derivations.count()             # how many there are
+    >>> derivations[k]                  # the k-th one, as a Tree
+    >>> for derivation in derivations:  # all of them, one at a time
+    >>>     ...
+
+Each derivation is built from its number when asked for, so skipping
+to the k-th one costs as much as building it. The count matches
+Objects.Counts. Cognates whose children were all pruned aren't in the
+tree and aren't choices.
+
+derivations.cheapest(cost) returns the derivation with the lowest total
+cost (see costs below), found in one bottom-up pass over the tree. Ties
+go to the earliest cognate.
+"""
+
+import random as _random
+from typing import Iterator
+
+from Objects.Trees import Tree
+
+
+class Derivations:
+
+    def __init__(self, tree: Tree):
+        self.tree = tree
+        self.locations = tree.unfold()
+        self._cognates = _cognates(self.locations)
+        self._counts = self._count()
+
+    def __repr__(self):
+        return f"Derivations({self.tree.root}: {self.count()})"
+
+    def __iter__(self) -> Iterator[Tree]:
+        return self.variants()
+
+    def __getitem__(self, index: int) -> Tree:
+        total = self.count()
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError(f"There are only {total} derivations.")
+        return self._unrank(index)
+
+    def count(self) -> int:
+        """Returns the number of derivations in the tree."""
+        return self._counts['0000']
+
+    def variants(self, start=0) -> Iterator[Tree]:
+        """Generates the derivations from the start-th one on."""
+        for index in range(start, self.count()):
+            yield self._unrank(index)
+
+    def sample(self, rng=_random) -> Tree:
+        """Returns a derivation picked uniformly at random."""
+        return self._unrank(rng.randrange(self.count()))
+
+    def cheapest(self, cost="nodes") -> Tree:
+        """Returns the derivation with the lowest total cost."""
+        costing = costs[cost]
+        totals = {}
+        choices = {}
+        for key in sorted(self.locations, key=len, reverse=True):
+            cognates = self._cognates.get(key, {})
+            total = costing(self.locations[key], cognates)
+            if cognates:
+                cheapest = min(cognates, key=lambda cognate: sum(
+                    totals[child] for child in cognates[cognate]))
+                choices[key] = cheapest
+                total += sum(totals[child] for child in cognates[cheapest])
+            totals[key] = total
+        derivation = Tree(self.tree.root)
+        pending = ['0000']
+        while pending:
+            key = pending.pop()
+            derivation[key] = self.locations[key]
+            if key in choices:
+                pending.extend(self._cognates[key][choices[key]])
+        return derivation
+
+    def _count(self) -> dict:
+        """Returns the number of derivations under each key."""
+        counts = {}
+        for key in sorted(self.locations, key=len, reverse=True):
+            cognates = self._cognates.get(key)
+            if not cognates:
+                counts[key] = 1
+                continue
+            total = 0
+            for children in cognates.values():
+                product = 1
+                for child in children:
+                    product *= counts[child]
+                total += product
+            counts[key] = total
+        return counts
+
+    def _unrank(self, index: int) -> Tree:
+        """Returns the index-th derivation."""
+        derivation = Tree(self.tree.root)
+        pending = [('0000', index)]
+        while pending:
+            key, index = pending.pop()
+            derivation[key] = self.locations[key]
+            for children in self._cognates.get(key, {}).values():
+                product = 1
+                for child in children:
+                    product *= self._counts[child]
+                if index < product:
+                    break
+                index -= product
+            else:
+                continue
+            for child in reversed(children):
+                index, child_index = divmod(index, self._counts[child])
+                pending.append((child, child_index))
+        return derivation
+
+
+costs = {
+    "nodes": lambda sequent, cognates: 1,
+    "leaves": lambda sequent, cognates: 0 if sequent.complexity else 1,
+    "non-invertible": lambda sequent, cognates: int(bool(cognates) and "000" not in cognates),
+}
+
+
+def _cognates(locations) -> dict:
+    """Returns the children of each key, grouped by cognate in order."""
+    cognates = {}
+    for key in sorted(locations):
+        if key != '0000':
+            parent = cognates.setdefault(key[:-4], {})
+            parent.setdefault(key[-4:-1], []).append(key)
+    return cognates
@@ -0,0 +1,112 @@
+"""
+This module estimates how large a sequent's decomposition tree will be
+without expanding any of it.
+
+Every connective in a sequent is decomposed exactly once along each
+path from the root to a leaf, and the side of the turnstile it is
+decomposed on is fixed by its polarity (negations and the left side of
+conditionals flip it). Each occurrence therefore has a branching
+factor, i.e. the number of children created when it is the principal:
+
+    ~                   1
+    forall, exists      the number of names in Names.json
+    R->, L&, Rv         1 (Mult) or 3 cognates (Add)
+    L->, R&, Lv         2 (Add) or 2 * 2^c (Mult), where c is the
+                        number of other propositions in the sequent
+
+No sequent in the tree holds more propositions than the root has atom
+occurrences, so c is at most that number minus one.
+
+estimate_sequent(sequent) returns upper bounds on the node count, the
+leaf count and the depth of the tree that Tree.populate() would build.
+"""
+
+from collections import namedtuple
+
+from Controllers.Settings import Settings
+from Objects import Names
+from Objects.Sequents import Sequent
+from Objects.Strategies import branches, decomposable_branches, sides
+from Propositions.BaseClasses import Atom, Quantifier
+from Propositions.Propositions import Negation, Conditional
+
+estimate = namedtuple('estimate', 'nodes, leaves, depth')
+
+
+def estimate_sequent(sequent: Sequent) -> estimate:
+    """Return upper bounds on the size of sequent's decomposition."""
+    factors = sorted(branching_factors(sequent), reverse=True)
+    leaves = 1
+    for factor in factors:
+        leaves *= factor
+    nodes = 1
+    level = 1
+    for factor in factors:
+        level *= factor
+        nodes += min(level, leaves)
+    return estimate(nodes, leaves, len(factors))
+
+
+def branching_factors(sequent: Sequent) -> list:
+    """Return the branching factor of every connective occurrence in
+    sequent."""
+    context = max(atom_occurrences(sequent) - 1, 0)
+    domain = None
+    factors = []
+    for rule in rule_occurrences(sequent):
+        if rule[1:] in ("forall", "exists"):
+            if domain is None:
+                domain = max(len(Names.load()), 1)
+            factors.append(domain)
+        else:
+            factors.append(branches(rule, Settings().get_rule(rule), context))
+    return factors
+
+
+def principal_branches(sequent: Sequent) -> int:
+    """Return the number of children decomposing sequent's principal
+    will produce."""
+    if not sequent.complexity:
+        return 0
+    side, _, proposition = sequent.principal
+    context = len(sequent.ant) + len(sequent.con) - 1
+    return decomposable_branches(proposition, side, context)
+
+
+def rule_occurrences(sequent: Sequent):
+    """Generates the rule (side + symbol) under which each connective
+    in sequent will be decomposed."""
+    for side in ("ant", "con"):
+        for proposition in getattr(sequent, side):
+            yield from _rules(proposition, sides[side])
+
+
+def atom_occurrences(sequent: Sequent) -> int:
+    """Returns the number of atom occurrences in sequent."""
+    return sum(_atoms(prop) for cedent in sequent for prop in cedent)
+
+
+def _rules(proposition, side: str):
+    """Generates the rules of proposition and its subpropositions,
+    taking into account which side each one ends up on."""
+    if isinstance(proposition, Atom):
+        return
+    yield side + proposition.symbol
+    flipped = "R" if side == "L" else "L"
+    if isinstance(proposition, Negation):
+        yield from _rules(proposition.prop, flipped)
+    elif isinstance(proposition, Quantifier):
+        yield from _rules(proposition.prop, side)
+    elif isinstance(proposition, Conditional):
+        yield from _rules(proposition.left, flipped)
+        yield from _rules(proposition.right, side)
+    else:
+        for prop in proposition:
+            yield from _rules(prop, side)
+
+
+def _atoms(proposition) -> int:
+    """Returns the number of atom occurrences in proposition."""
+    if isinstance(proposition, Atom):
+        return 1
+    return sum(_atoms(prop) for prop in proposition)
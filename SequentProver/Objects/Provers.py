@@ -0,0 +1,121 @@
+"""
+This module contains the Prover class, which decides whether sequents
+are derivable from a base of atomic sequents without building their
+whole trees.
+
+The search is goal-directed and built on Sequent.decompose(). An
+invertible decomposition is an AND node: the sequent is derivable if
+all of its children are. A non-invertible decomposition is an OR node
+over its cognates: the sequent is derivable if all the children of any
+one cognate are. The search stops at the first cognate that succeeds
+and at the first child that fails.
+
+An atomic sequent is derivable if it is in the base or, with
+reflexivity on, if it is reflexive.
+
+Every subgoal is tabled, so a sequent showing up more than once (in the
+same tree or in another one proved by the same Prover) is only decided
+once. The table assumes the rules don't change while the Prover is in
+use.
+
+Prover().prove(sequent) returns a verdict: whether the sequent is
+derivable and, if it is, a witness. The witness is a Tree holding one
+derivation, i.e. the sequent and the children of exactly one cognate at
+every step, with the same keys Tree.populate() would give them.
+"""
+
+import json
+import os
+from collections import namedtuple
+from itertools import islice
+
+from Controllers.Settings import Settings
+from Objects.Sequents import Sequent
+from Objects.Trees import Tree, generate_cognates
+from Propositions.Converters import String
+
+verdict = namedtuple('verdict', 'is_derivable, witness')
+
+_current_dir = os.path.dirname(__file__)
+_atoms_path = os.path.join(_current_dir, "..", "data", "Atoms.json")
+
+
+class Prover:
+
+    def __init__(self, base=None):
+        """base is any container of atomic sequents (a set, a list or
+        a BaseIndex, for example). Defaults to the sequents in
+        Atoms.json."""
+        if base is None:
+            base = load_base()
+        self.base = base
+        self.table = {}
+
+    def __repr__(self):
+        return f"Prover({len(self.table)} tabled)"
+
+    def prove(self, sequent: Sequent) -> verdict:
+        """Return whether sequent is derivable and a witness if so."""
+        if self._is_derivable(sequent):
+            return verdict(True, self._witness(sequent))
+        return verdict(False, None)
+
+    def is_derivable(self, sequent: Sequent) -> bool:
+        """Return whether sequent is derivable."""
+        return self._is_derivable(sequent)
+
+    def _is_derivable(self, sequent: Sequent) -> bool:
+        """Decides and tables sequent, along with the index of the
+        dimension (cognate) that derives it."""
+        if sequent in self.table:
+            return self.table[sequent][0]
+        choice = None
+        if not sequent.complexity:
+            derivable = self._is_axiom(sequent)
+        elif sequent.principal.proposition.is_invertible:
+            derivable = all(self._is_derivable(child) for child in next(sequent.dimensions()))
+            choice = 0
+        else:
+            derivable = False
+            for index, dimension in enumerate(sequent.dimensions()):
+                if all(self._is_derivable(child) for child in dimension):
+                    derivable = True
+                    choice = index
+                    break
+        self.table[sequent] = derivable, choice
+        return derivable
+
+    def _is_axiom(self, sequent: Sequent) -> bool:
+        """Whether an atomic sequent is derivable."""
+        if sequent in self.base:
+            return True
+        return bool(Settings()['Reflexivity']) and sequent.is_reflexive
+
+    def _witness(self, sequent: Sequent) -> Tree:
+        """Returns the derivation of a derivable sequent as a tree."""
+        witness = Tree(sequent)
+        pending = [('0000', sequent)]
+        while pending:
+            key, parent = pending.pop()
+            choice = self.table[parent][1]
+            if choice is None:
+                continue
+            dimension = next(islice(parent.dimensions(), choice, None))
+            if parent.principal.proposition.is_invertible:
+                cognate = "000"
+            else:
+                cognate = next(islice(generate_cognates(), choice, None))
+            locations = ("M",) if len(dimension) == 1 else ("L", "R")
+            for location, child in zip(locations, dimension):
+                child_key = key + cognate + location
+                witness[child_key] = child
+                pending.append((child_key, child))
+        return witness
+
+
+def load_base(path=_atoms_path) -> set:
+    """Returns the atomic sequents stored in path (by default
+    Atoms.json)."""
+    with open(path, "r") as file:
+        atoms = json.load(file)
+    return {String(atom).to_sequent() for atom in atoms}
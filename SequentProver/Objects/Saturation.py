@@ -0,0 +1,110 @@
+"""
+This module contains the Saturation class, which classifies many
+sequents against one base of atomic sequents at once by forward
+chaining.
+
+Rather than searching backwards from each target, a Saturation first
+collects every sequent the targets decompose into (their universe,
+made up of the targets' subformulas only). Sequents shared between
+targets are only collected once. It then works forwards from the
+atomic sequents in the base, applying the rules in reverse: a sequent
+becomes derivable as soon as every child of one of its decompositions
+(its only one, if invertible) is derivable. The result is the set of
+derivable sequents in the universe, so membership answers every target.
+
+The verdicts agree with Objects.Provers.Prover: an atomic sequent is
+derivable if it is in the base or, with reflexivity on, if it is
+reflexive. Targets can be added at any time and only the new part of
+the universe gets expanded. Like the Prover, a Saturation assumes the
+rules don't change while it's in use.
+"""
+
+from Controllers.Settings import Settings
+from Objects.Provers import load_base
+from Objects.Sequents import Sequent
+
+
+class Saturation:
+
+    def __init__(self, base=None):
+        """base is any container of atomic sequents. Defaults to the
+        sequents in Atoms.json."""
+        if base is None:
+            base = load_base()
+        self.base = base
+        self.derivable = set()
+        self.universe = set()
+        self._parents = {}      # child -> [(parent, dimension index), ...]
+        self._remaining = {}    # (parent, dimension index) -> underived children
+
+    def __repr__(self):
+        return f"Saturation({len(self.derivable)} of {len(self.universe)} derivable)"
+
+    def __contains__(self, sequent: Sequent) -> bool:
+        """Whether sequent is a derivable sequent of the universe."""
+        return sequent in self.derivable
+
+    def __len__(self) -> int:
+        return len(self.derivable)
+
+    def classify(self, targets) -> dict:
+        """Adds targets and returns whether each of them is
+        derivable."""
+        targets = list(targets)
+        self.add(targets)
+        return {target: target in self.derivable for target in targets}
+
+    def add(self, targets) -> None:
+        """Adds targets and everything they decompose into to the
+        universe, then saturates it."""
+        dimensions = self._expand(targets)
+        pending = []
+        for parent, children in dimensions.items():
+            if not parent.complexity:
+                if self._is_axiom(parent):
+                    pending.append(parent)
+                continue
+            for index, dimension in enumerate(children):
+                dimension = set(dimension)
+                underived = [c for c in dimension if c not in self.derivable]
+                self._remaining[(parent, index)] = len(underived)
+                for child in underived:
+                    self._parents.setdefault(child, []).append((parent, index))
+                if not underived:
+                    pending.append(parent)
+        self._saturate(pending)
+
+    def _expand(self, targets) -> dict:
+        """Returns every new sequent of the universe, along with its
+        decomposition."""
+        dimensions = {}
+        pending = [target for target in targets if target not in self.universe]
+        while pending:
+            sequent = pending.pop()
+            if sequent in self.universe:
+                continue
+            self.universe.add(sequent)
+            children = sequent.decompose() if sequent.complexity else []
+            dimensions[sequent] = children
+            for dimension in children:
+                pending.extend(c for c in dimension if c not in self.universe)
+        return dimensions
+
+    def _saturate(self, pending: list) -> None:
+        """Marks pending sequents as derivable, along with every parent
+        that becomes derivable as a result."""
+        while pending:
+            sequent = pending.pop()
+            if sequent in self.derivable:
+                continue
+            self.derivable.add(sequent)
+            for parent, index in self._parents.pop(sequent, []):
+                self._remaining[(parent, index)] -= 1
+                if not self._remaining[(parent, index)]:
+                    pending.append(parent)
+
+    def _is_axiom(self, sequent: Sequent) -> bool:
+        """Whether an atomic sequent is derivable."""
+        if sequent in self.base:
+            return True
+        return bool(Settings()['Reflexivity']) and sequent.is_reflexive
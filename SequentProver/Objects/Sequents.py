@@ -15,6 +15,12 @@ proposition.
 .is_reflexive returns a boolean value reflecting whether any of the
 antecedents appear in the consequent.
 
+With the Permutation structural rule on, antecedents and consequents
+are multisets: they are kept in a canonical order, so sequents that
+only differ in the order of their propositions are equal (and hash
+equally). With Contraction on, repeated propositions are dropped from
+each side as well.
+
 .decompose() returns either a tuple of sequents (for invertible
 sequents) or a tuple of tuples of sequents (non-invertible
 sequents). When calling this, you should be prepared to handle
@@ -25,28 +31,36 @@ have its .decompose() called.
 
 import itertools
 from collections import namedtuple
-from typing import Sequence, Any, Generator
+from typing import Sequence, Union
 
 import Propositions
 import Propositions.Decomposables
+from Controllers.Settings import Settings
+from Objects import Strategies
 
 principal = namedtuple('principal', 'side, index, proposition')
+_vetoed = object()   # a child rejected by a veto other than is_reflexive
 
 
 class Sequent:
     """The main concern of the Sequent Prover.
 
     Complexity is the number of connectives in the sequent.
-    The principal is the leftmost proposition with one or more connectives.
+    The principal is the proposition with one or more connectives
+    chosen by the current principal strategy (cf. Objects.Strategies),
+    by default the leftmost one.
     """
 
-    __slots__ = ["_ant", "_con", "_complexity", "_principal", "_is_reflexive"]
+    __slots__ = ["_ant", "_con", "_complexity", "_principal", "_position",
+                 "_is_reflexive"]
 
     def __init__(self, antecedent: Sequence, consequent: Sequence):
-        self._ant = tuple(prop for prop in antecedent)
-        self._con = tuple(prop for prop in consequent)
+        contraction, permutation = _structural_rules()
+        self._ant = _cedent(antecedent, contraction, permutation)
+        self._con = _cedent(consequent, contraction, permutation)
         self._complexity = None
         self._principal = None
+        self._position = None
         self._is_reflexive = None
 
     def __repr__(self) -> str:
@@ -77,6 +91,9 @@ class Sequent:
             return False
         return True
 
+    def __hash__(self) -> int:
+        return hash((self.ant, self.con))
+
     def __iter__(self) -> list:
         yield self.ant
         yield self.con
@@ -106,7 +123,9 @@ class Sequent:
         side, proposition = a decomposable proposition (cf.
         Decomposables.py in Propositions)."""
         if self._principal is None:
-            attributes = self._get_principal()
+            attributes = self._position
+            if attributes is None:
+                attributes = self._get_principal()
             proposition = Propositions.Decomposables.create(attributes)
             self._principal = principal(attributes.side, attributes.index, proposition)
         return self._principal
@@ -118,7 +137,7 @@ class Sequent:
             self._is_reflexive = self._get_reflexivity()
         return self._is_reflexive
 
-    def decompose(self):
+    def decompose(self, vetoes=()):
         """Return the result of decomposing this sequent.
 
         Due to possible complexity, this ends up being a list of tuples
@@ -150,36 +169,50 @@ class Sequent:
         >>>     left = results[0]
         >>>     right = results[1]
         >>>     print(f"Left child is: {left}. Right child is: {right}")
+
+        vetoes is a sequence of predicates taking a child's antecedent
+        and consequent (as lists) and returning whether that child
+        should be pruned. Pruned children are checked before they are
+        built and show up as None in the results. A child rejected by
+        any veto but is_reflexive takes the rest of its dimension with
+        it (every child of that dimension is None), since no derivation
+        goes through a dimension with a rejected premise.
         """
+        return list(self.dimensions(vetoes))
 
+    def dimensions(self, vetoes=()):
+        """Generates the dimensions of decompose() one at a time, so
+        that a caller that stops early (e.g. at the first derivable
+        cognate) never builds the rest of them."""
         units: tuple = self.principal.proposition.decompose()
         templates: Sequent = self._templates()
-        result = [r for r in self._recombine(units, templates)]
-        return result
+        result = self._recombine(units, templates, vetoes)
+        if any(veto is not is_reflexive for veto in vetoes):
+            for dimension in result:
+                yield _unless_vetoed(dimension)
+        else:
+            yield from result
 
     def _get_principal(self):
         """Returns side, index, type of the principal proposition."""
+        return Strategies.select(self, self._candidates())
+
+    def _candidates(self):
+        """Generates side, index, type of every proposition that can be
+        decomposed."""
         for side in ("ant", "con"):
             for index, proposition in enumerate(getattr(self, side)):
                 if proposition.complexity > 0:
-                    return principal(side, index, proposition)
+                    yield principal(side, index, proposition)
 
     def _get_reflexivity(self):
         """Checks whether this sequent is reflexive."""
-        for antecedent in self.ant:
-            for consequent in self.con:
-                if antecedent == consequent:
-                    return True
-        return False
+        return is_reflexive(self.ant, self.con)
 
-    def _templates(self):  # Split explosive portion into two for 1-/2-parent explosives
-        """If the principal is_explosive, returns a generator of 2-
-        tuples, with template[0] being the left child and template[1]
-        being the right child. Otherwise, the base template (which is
-        just a sequent) is returned."""
-        proposition = self.principal.proposition
-        if proposition.is_explosive and proposition.arity == 2:
-            return (template for template in self._permute_two_parent_template())
+    def _templates(self):
+        """Returns the base template (see _Template). Explosive
+        principals split it between their two children as they are
+        recombined (see _split)."""
         return self._base_template()
 
     def _base_template(self):
@@ -194,83 +227,267 @@ class Sequent:
             # noinspection PyTypeChecker
             # PTC thinks this is not an int
             del temp_con[self.principal.index]
-        return Sequent(temp_ant, temp_con)
-
-    def _permute_two_parent_template(self) -> Generator[tuple, list, None]:
-        """Yields possible two-parent templates for explosive sequents."""
-        base: Sequent = self._base_template()
-        ant_permutations = _permute_two_parent(base.ant)
-        for antecedent in ant_permutations:
-            con_permutations = _permute_two_parent(base.con)
-            for consequent in con_permutations:
-                yield Sequent(antecedent[0], consequent[0]), \
-                      Sequent(antecedent[1], consequent[1])
-
-    def _recombine(self, units, templates):
+        complexity = self.complexity - self.principal.proposition.complexity
+        is_exact = not any(_structural_rules())
+        is_leftmost = Settings().get("Principal Strategy", "Leftmost") == "Leftmost"
+        return _Template(temp_ant, temp_con, complexity, is_exact, is_leftmost)
+
+    def _recombine(self, units, templates, vetoes=()):
         """Yields results of putting the units with the templates in
         the right way."""
         proposition = self.principal.proposition
         if proposition.is_explosive and proposition.arity == 2:
-            yield from _recombine_multiplicative_two_parent(templates, units)
+            yield from _recombine_multiplicative_two_parent(templates, units, vetoes)
         elif proposition.is_invertible:
             if len(units) == 1:
-                yield from _recombine_multiplicative_one_parent(templates, units)
+                yield from _recombine_multiplicative_one_parent(templates, units, vetoes)
             else:
-                yield from _recombine_additive_two_parent(templates, units)
+                yield from _recombine_additive_two_parent(templates, units, vetoes)
         else:
-            yield from _recombine_additive_one_parent(templates, units)
-
-
-def _permute_two_parent(propositions: tuple) -> Generator[tuple, Any, None]:
-    """Generates possible combinations for propositions in sides of two
-    parent multiplicative rules."""
-    permutations = [
-        tuple(i) for i in itertools.product([0, 1], repeat=len(propositions))
-    ]
-    for permutation in permutations:
-        x = []
-        y = []
-        for i, value in enumerate(permutation):
-            if value:
-                y.append(propositions[i])
-            else:
-                x.append(propositions[i])
-        yield x, y
+            yield from _recombine_additive_one_parent(templates, units, vetoes)
+
+
+class _Template:
+    """The part of a sequent its children inherit unchanged, i.e. the
+    sequent minus its principal or one side of a split of that.
 
+    Along with the propositions themselves, templates hold what a child
+    needs to work out its complexity, reflexivity and (leftmost)
+    principal from its parent's, so that building a child only costs as
+    much as the unit of decomposition added to the template. Everything
+    but the complexity is worked out the first time a child needs it.
+
+    is_exact is whether children keep their propositions as given (i.e.
+    neither contraction nor permutation is on) and is_leftmost whether
+    their principal is the leftmost proposition.
+    """
+
+    __slots__ = ["ant", "con", "complexity", "is_exact", "is_leftmost",
+                 "_sets", "_is_reflexive", "_first"]
+
+    def __init__(self, antecedent: list, consequent: list, complexity=None,
+                 is_exact=True, is_leftmost=False):
+        self.ant = antecedent
+        self.con = consequent
+        if complexity is None:
+            complexity = sum([a.complexity for a in antecedent]) \
+                         + sum([c.complexity for c in consequent])
+        self.complexity = complexity
+        self.is_exact = is_exact
+        self.is_leftmost = is_leftmost
+        self._sets = None
+        self._is_reflexive = None
+        self._first = None
 
-def _recombine_additive_two_parent(templates, units):
+    @property
+    def ant_set(self) -> set:
+        """The antecedents, hashed for fast lookups."""
+        if self._sets is None:
+            self._sets = set(self.ant), set(self.con)
+        return self._sets[0]
+
+    @property
+    def con_set(self) -> set:
+        """The consequents, hashed for fast lookups."""
+        if self._sets is None:
+            self._sets = set(self.ant), set(self.con)
+        return self._sets[1]
+
+    @property
+    def is_reflexive(self) -> bool:
+        if self._is_reflexive is None:
+            self._is_reflexive = not self.ant_set.isdisjoint(self.con_set)
+        return self._is_reflexive
+
+    @property
+    def first_ant(self) -> Union[int, None]:
+        """Index of the first antecedent with connectives, if any."""
+        if self._first is None:
+            self._first = _first_complex(self.ant), _first_complex(self.con)
+        return self._first[0]
+
+    @property
+    def first_con(self) -> Union[int, None]:
+        """Index of the first consequent with connectives, if any."""
+        if self._first is None:
+            self._first = _first_complex(self.ant), _first_complex(self.con)
+        return self._first[1]
+
+
+def _structural_rules() -> tuple:
+    """Returns whether contraction and permutation are on."""
+    return bool(Settings().get("Contraction")), bool(Settings().get("Permutation"))
+
+
+def _cedent(propositions: Sequence, contraction: bool, permutation: bool) -> tuple:
+    """Returns propositions as a cedent: without repeats if contraction
+    is on and in canonical (string) order if permutation is on."""
+    if contraction:
+        propositions = dict.fromkeys(propositions)
+    if permutation:
+        return tuple(sorted(propositions, key=str))
+    return tuple(prop for prop in propositions)
+
+
+def is_reflexive(antecedent, consequent) -> bool:
+    """Veto for reflexive children: whether any of the antecedents
+    appear in the consequent."""
+    return not set(antecedent).isdisjoint(consequent)
+
+
+def _first_complex(propositions) -> Union[int, None]:
+    """Returns the index of the first proposition with one or more
+    connectives, if there is one."""
+    for index, proposition in enumerate(propositions):
+        if proposition.complexity > 0:
+            return index
+    return None
+
+
+def _child(unit, template, vetoes):
+    """Returns the sequent made of unit followed by template, or None
+    if it is reflexive and is_reflexive is among the vetoes (_vetoed if
+    any other veto rejects it). The child's complexity,
+    reflexivity and leftmost principal are derived from the template's
+    rather than computed from scratch."""
+    antecedent = unit.ant + template.ant
+    consequent = unit.con + template.con
+    reflexive = None
+    for veto in vetoes:
+        if veto is is_reflexive:
+            reflexive = _inherited_reflexivity(unit, template)
+            if reflexive:
+                return None
+        elif veto(antecedent, consequent):
+            return _vetoed
+    child = Sequent(antecedent, consequent)
+    child._is_reflexive = reflexive
+    if template.is_exact:
+        child._complexity = template.complexity \
+            + sum([prop.complexity for prop in unit.ant]) \
+            + sum([prop.complexity for prop in unit.con])
+        if child._complexity and template.is_leftmost:
+            child._position = _leftmost_position(unit, template)
+    return child
+
+
+def _unless_vetoed(dimension: tuple) -> tuple:
+    """Returns dimension, or all None if _child vetoed any of it."""
+    for child in dimension:
+        if child is _vetoed:
+            return (None,) * len(dimension)
+    return dimension
+
+
+def _inherited_reflexivity(unit, template) -> bool:
+    """Returns whether the sequent made of unit followed by template is
+    reflexive, only looking up the unit's propositions."""
+    if template.is_reflexive:
+        return True
+    for prop in unit.ant:
+        if prop in template.con_set or prop in unit.con:
+            return True
+    for prop in unit.con:
+        if prop in template.ant_set:
+            return True
+    return False
+
+
+def _leftmost_position(unit, template):
+    """Returns the leftmost principal of the sequent made of unit
+    followed by template."""
+    index = _first_complex(unit.ant)
+    if index is not None:
+        return principal("ant", index, unit.ant[index])
+    if template.first_ant is not None:
+        index = len(unit.ant) + template.first_ant
+        return principal("ant", index, template.ant[template.first_ant])
+    index = _first_complex(unit.con)
+    if index is not None:
+        return principal("con", index, unit.con[index])
+    if template.first_con is not None:
+        index = len(unit.con) + template.first_con
+        return principal("con", index, template.con[template.first_con])
+    return None
+
+
+def _recombine_additive_two_parent(templates, units, vetoes=()):
     """Yields sequents decomposed from Additive Right If, Left And,
     and Right Or."""
-    x_ant = units[0].ant + [prop for prop in templates.ant]
-    x_con = units[0].con + [prop for prop in templates.con]
-    y_ant = units[1].ant + [prop for prop in templates.ant]
-    y_con = units[1].con + [prop for prop in templates.con]
-    yield Sequent(x_ant, x_con), Sequent(y_ant, y_con)
+    yield _child(units[0], templates, vetoes), _child(units[1], templates, vetoes)
 
 
-def _recombine_additive_one_parent(template, units):
+def _recombine_additive_one_parent(template, units, vetoes=()):
     """Yields sequents decomposed from Additive Left If, Right And,
     and Left Or."""
     for unit in units:
-        antecedent = unit.ant + [prop for prop in template.ant]
-        consequent = unit.con + [prop for prop in template.con]
-        yield Sequent(antecedent, consequent),
+        yield _child(unit, template, vetoes),
 
 
-def _recombine_multiplicative_one_parent(templates, units):
+def _recombine_multiplicative_one_parent(templates, units, vetoes=()):
     """Yields sequents decomposed from Multiplicative Right If,
     Left And, and Right Or."""
-    antecedent = units[0].ant + [prop for prop in templates.ant]
-    consequent = units[0].con + [prop for prop in templates.con]
-    yield Sequent(antecedent, consequent),
+    yield _child(units[0], templates, vetoes),
 
 
-def _recombine_multiplicative_two_parent(templates, units):
+def _recombine_multiplicative_two_parent(template, units, vetoes=()):
     """Yields sequents decomposed from Multiplicative Left If,
     Left And, and Right Or."""
-    for template in templates:
-        x_ant = units[0].ant + [prop for prop in template[0].ant]
-        x_con = units[0].con + [prop for prop in template[0].con]
-        y_ant = units[1].ant + [prop for prop in template[1].ant]
-        y_con = units[1].con + [prop for prop in template[1].con]
-        yield Sequent(x_ant, x_con), Sequent(y_ant, y_con)
+    yield from _split(template, units, vetoes)
+
+
+def _halves(propositions: list):
+    """Generates every way of splitting propositions in two, in the
+    order of the splits' binary numbers (0 for the first half)."""
+    for split in itertools.product((0, 1), repeat=len(propositions)):
+        halves = [], []
+        for prop, which in zip(propositions, split):
+            halves[which].append(prop)
+        yield halves
+
+
+def _split(template, units, vetoes=()):
+    """Yields the left and right child of every way of splitting
+    template between units, in the order of the splits' binary
+    numbers (antecedents first, 0 for left). A side that is already
+    reflexive part way through a split stays so however the split is
+    finished, so with is_reflexive among the vetoes that side is None
+    in every such split and its propositions are never gathered nor
+    its children built; once both sides are, the remaining splits are
+    (None, None) outright. The other vetoes only judge whole children,
+    in _child, and without is_reflexive the splits are simply counted
+    out."""
+    if is_reflexive not in vetoes:
+        for ant in _halves(template.ant):
+            for con in _halves(template.con):
+                yield tuple(_child(unit, _Template(
+                    ant[side], con[side], None, template.is_exact,
+                    template.is_leftmost), vetoes) for side, unit in enumerate(units))
+        return
+    props = [("ant", prop) for prop in template.ant] + \
+            [("con", prop) for prop in template.con]
+
+    def split(index, sides):
+        if all(side is None for side in sides):
+            yield from itertools.repeat((None, None), 2 ** (len(props) - index))
+            return
+        if index == len(props):
+            yield tuple(None if side is None else _child(unit, _Template(
+                list(side[0]), list(side[1]), None, template.is_exact,
+                template.is_leftmost), vetoes) for unit, side in zip(units, sides))
+            return
+        cedent, prop = props[index]
+        for which in (0, 1):
+            extended = None
+            if sides[which] is not None:
+                ant, con = sides[which]
+                if cedent == "ant" and prop not in units[which].con:
+                    extended = ant + (prop,), con
+                elif cedent == "con" and prop not in units[which].ant \
+                        and prop not in ant:
+                    extended = ant, con + (prop,)
+            yield from split(index + 1, (extended, sides[1]) if which == 0
+                             else (sides[0], extended))
+
+    yield from split(0, tuple(None if is_reflexive(unit.ant, unit.con)
+                              else ((), ()) for unit in units))
@@ -0,0 +1,120 @@
+"""
+This module contains the strategies for choosing a sequent's principal,
+i.e. which of its propositions gets decomposed next.
+
+Every strategy takes a sequent and a generator of its candidates, which
+are principal tuples (side, index, proposition) for each proposition
+with one or more connectives, in reading order (antecedent first). It
+returns the candidate to decompose. Ties always go to the leftmost
+candidate, so every strategy is deterministic.
+
+The strategy in use is Settings()["Principal Strategy"]:
+
+    Leftmost            the leftmost candidate (the original behaviour)
+    Invertible First    the leftmost candidate with an invertible rule
+    Non-Explosive First the leftmost candidate with a non-explosive rule
+    Fewest Branches     the candidate producing the fewest children
+    User Order          the first candidate by Settings()["Principal
+                        Order"], a list of rules such as "L&" or "R->"
+"""
+
+from Controllers.Settings import Settings
+from Objects import Names
+import Propositions.Decomposables
+
+sides = {"ant": "L", "con": "R"}     # side of a sequent: its rules' prefix
+two_parent = {"L->", "R&", "Lv"}     # rules that are two-parent when invertible
+_quantifiers = {"forall", "exists"}
+default_order = ["L~", "R~", "R->", "L&", "Rv", "L->", "R&", "Lv",
+                 "Lforall", "Rforall", "Lexists", "Rexists"]
+
+
+def select(sequent, candidates):
+    """Return the principal chosen by the current strategy (or None if
+    there are no candidates)."""
+    strategy = strategies[Settings().get("Principal Strategy", "Leftmost")]
+    return strategy(sequent, candidates)
+
+
+def leftmost(sequent, candidates):
+    """Return the leftmost candidate."""
+    return next(candidates, None)
+
+
+def invertible_first(sequent, candidates):
+    """Return the leftmost candidate with an invertible rule."""
+    return _first(candidates, lambda prop: prop.is_invertible)
+
+
+def non_explosive_first(sequent, candidates):
+    """Return the leftmost candidate with a non-explosive rule."""
+    return _first(candidates, lambda prop: not prop.is_explosive)
+
+
+def fewest_branches(sequent, candidates):
+    """Return the candidate whose decomposition has the fewest
+    children."""
+    context = len(sequent.ant) + len(sequent.con) - 1
+
+    def rank(candidate):
+        proposition = Propositions.Decomposables.create(candidate)
+        return decomposable_branches(proposition, candidate.side, context)
+
+    return min(candidates, default=None, key=rank)
+
+
+def user_order(sequent, candidates):
+    """Return the first candidate in the order of the rules in
+    Settings()["Principal Order"]."""
+    order = Settings().get("Principal Order", default_order)
+
+    def rank(candidate):
+        rule = sides[candidate.side] + candidate.proposition.symbol
+        return order.index(rule) if rule in order else len(order)
+
+    return min(candidates, default=None, key=rank)
+
+
+def decomposable_branches(proposition, side: str, context: int) -> int:
+    """Return the number of children produced by decomposing the
+    decomposable proposition on side alongside context other
+    propositions."""
+    if proposition.symbol in _quantifiers:
+        return len(Names.load())
+    return branches(sides[side] + proposition.symbol, proposition.rule, context)
+
+
+def branches(rule: str, mode: str, context: int) -> int:
+    """Return the number of children produced by decomposing a
+    proposition under rule (e.g. "L&") in mode ("Add", "Mult" or
+    "Neg") alongside context other propositions."""
+    if mode == "Neg":
+        return 1
+    if rule in two_parent:
+        if mode == "Add":
+            return 2
+        return 2 * 2 ** context
+    if mode == "Add":
+        return 3
+    return 1
+
+
+def _first(candidates, condition):
+    """Return the first candidate whose decomposable version meets
+    condition, falling back on the leftmost candidate."""
+    leftmost_candidate = None
+    for candidate in candidates:
+        if leftmost_candidate is None:
+            leftmost_candidate = candidate
+        if condition(Propositions.Decomposables.create(candidate)):
+            return candidate
+    return leftmost_candidate
+
+
+strategies = {
+    "Leftmost": leftmost,
+    "Invertible First": invertible_first,
+    "Non-Explosive First": non_explosive_first,
+    "Fewest Branches": fewest_branches,
+    "User Order": user_order,
+}
@@ -1,15 +1,53 @@
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque, namedtuple
 from collections.abc import MutableMapping
-from itertools import product
+from itertools import product, count
 from typing import Union
 
+try:
+    import resource     # not available on Windows
+except ImportError:
+    resource = None
+
 from Propositions.Converters import String
 from Controllers.Settings import Settings
-from Objects.Sequents import Sequent
+from Objects.Estimates import principal_branches
+from Objects.Sequents import Sequent, is_reflexive
+from Objects.Strategies import sides, two_parent
+
+explosion = namedtuple('explosion', 'lefts, rights, pairings')
+expansion = namedtuple('expansion', 'rule, mode, side, index')
 
 
 class Tree(MutableMapping):
 
-    def __init__(self, sequent: Union[Sequent, str], source=None):
+    def __init__(self, sequent: Union[Sequent, str], source=None, vetoes=(),
+                 factorise=False, share=False):
+        """With factorise, the children of multiplicative two-parent
+        explosions are stored once per distinct sequent rather than
+        once per cognate (see _factorised_decomp), and a sequent that
+        explodes again elsewhere in the tree links its children to
+        those of its first explosion (self.exploded maps each exploded
+        sequent to the key it first exploded at) instead of being
+        decomposed again. With share, every child equal to a sequent
+        already in the tree, wherever it is, is left out and its
+        subtree is shared with that sequent's, so the tree is stored as
+        a DAG (self.nodes maps each distinct sequent to its key).
+        Children left out are recorded in self.links, which maps their
+        keys to the key of the equal sequent that was kept, and each
+        factorised explosion is recorded in self.explosions by its
+        parent's key. locations() unfolds the tree into every key an
+        unshared one would have and resolve() looks up any one of them.
+
+        self.pruned counts the children pruned in the tree as it is
+        stored. A child pruned in a subtree that is linked to from
+        elsewhere is counted once, not once per location it unfolds
+        into, so with factorise or share self.pruned can be lower than
+        an unshared tree's."""
         if isinstance(sequent, str):
             sequent = String(sequent).to_sequent()
         if not isinstance(sequent, Sequent):
@@ -18,6 +56,18 @@ class Tree(MutableMapping):
         self.update({'0000': sequent})
         self.root = self.leaves['0000']
         self.has_been_truncated = False
+        self.pruned = 0
+        self.vetoes = list(vetoes)
+        self.is_partial = False
+        self.frontier = []
+        self.factorise = factorise
+        self.share = share
+        self.nodes = {self.root: '0000'} if share else {}
+        self.links = {}
+        self.explosions = {}
+        self.exploded = {}
+        self.expansions = {}
+        self.structure = _structure()
         if source is not None:
             self.fill_with(source)
 
@@ -49,17 +99,219 @@ class Tree(MutableMapping):
             return True
         return False
 
-    def populate(self) -> None:
+    def populate(self, checkpoint=None, interval=60.0) -> None:
         """Pseudo-recursively fills the tree with the results of
-        decomposing each sequent in it."""
+        decomposing each sequent in it. Sequents that have already been
+        decomposed (see self.expansions) are skipped.
+
+        With checkpoint (a file path), the tree is saved there every
+        interval seconds and when the expansion is interrupted, and
+        the file is removed once the tree is finished. resume() loads
+        the tree from the file again, so that populating it carries on
+        where it stopped and finishes with the same tree."""
+        saved = time.monotonic()
         for complexity in range(self.root.complexity, 0, -1):
             items = [(k, v) for k, v in self.items()]
             for item in items:
                 key = item[0]
                 sequent: Sequent = item[1]
-                if sequent.complexity == complexity:
-                    new_items: dict = self._decompose(key, sequent)
-                    self.update(new_items)
+                if sequent.complexity == complexity and key not in self.expansions:
+                    pruned = self.pruned, self.has_been_truncated
+                    try:
+                        new_items: dict = self._decompose(key, sequent)
+                        self.update(new_items)
+                    except BaseException:    # e.g. KeyboardInterrupt
+                        self._undo(key, *pruned)
+                        if checkpoint is not None:
+                            self.save(checkpoint)
+                        raise
+                    if checkpoint is not None and time.monotonic() - saved >= interval:
+                        self.save(checkpoint)
+                        saved = time.monotonic()
+        if checkpoint is not None and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+    def save(self, path: str) -> None:
+        """Saves everything needed to carry on expanding the tree (see
+        resume()) to path, replacing the old file in one step so that
+        an interruption never leaves half a file behind."""
+        state = {"settings": repr(Settings().fingerprint()),
+                 "factorise": self.factorise,
+                 "share": self.share,
+                 "pruned": self.pruned,
+                 "has_been_truncated": self.has_been_truncated,
+                 "leaves": {key: str(sequent) for key, sequent in self.items()},
+                 "links": self.links,
+                 "explosions": self.explosions,
+                 "expansions": self.expansions}
+        temporary = path + ".tmp"
+        with open(temporary, "w") as file:
+            file.write(json.dumps(state))
+        os.replace(temporary, path)
+
+    def expand(self, score="complexity", max_nodes=None, max_memory=None,
+               max_seconds=None) -> None:
+        """Fills the tree best-first, always decomposing the unexpanded
+        sequent with the lowest score (see scores below), until
+        everything is expanded or one of the limits is reached.
+
+        The expansion stops before the tree would hold more than
+        max_nodes sequents (a decomposition whose children don't fit is
+        undone, so the limit is never passed), once the process'
+        current resident memory reaches max_memory bytes (see
+        _resident_memory) or once max_seconds have passed. The time
+        and memory limits are checked between decompositions, so the
+        last one may take the tree past them. When a limit stops the
+        expansion, the tree is marked as partial and self.frontier
+        lists the keys of the sequents that were never decomposed.
+        Every other sequent in the tree has all of its children, so a
+        partial tree can be exported and displayed like any other."""
+        scoring = scores[score]
+        started = time.monotonic()
+        tiebreaker = count()
+        heap = []
+        parents = {key[:-4] for key in self}
+        for key, sequent in self.items():
+            if sequent.complexity and key not in parents \
+                    and key not in self.expansions:
+                heapq.heappush(heap, (scoring(key, sequent), next(tiebreaker), key))
+        while heap:
+            if _limit_reached(len(self), max_nodes, max_memory,
+                              max_seconds, started):
+                break
+            *_, key = heapq.heappop(heap)
+            pruned = self.pruned, self.has_been_truncated
+            new_items: dict = self._decompose(key, self[key])
+            if max_nodes is not None and len(self) + len(new_items) > max_nodes:
+                self._undo(key, *pruned)
+                heapq.heappush(heap, (scoring(key, self[key]), next(tiebreaker), key))
+                break
+            self.update(new_items)
+            for new_key, new_sequent in new_items.items():
+                if new_sequent.complexity:
+                    heapq.heappush(heap, (scoring(new_key, new_sequent),
+                                          next(tiebreaker), new_key))
+        self.frontier = sorted(item[-1] for item in heap)
+        self.is_partial = bool(self.frontier)
+
+    def refresh(self) -> list:
+        """Brings the tree up to date with the current rules, only
+        re-expanding the subtrees that depend on a rule that changed.
+
+        Each expanded sequent's rule, mode and principal are recorded in
+        self.expansions (or, for imported trees, inferred from the
+        keys). A sequent is stale if its rule has changed mode or a
+        different proposition would now be its principal. Its subtree
+        is then thrown away and expanded again, while everything else
+        is kept. Compound sequents without children that were never
+        recorded as expanded (in imported trees, those whose children
+        were all pruned) are expanded again as well. A change of
+        structural rules, or a factorised or shared tree, rebuilds the
+        whole tree. Returns the keys of the sequents that were
+        re-expanded."""
+        if self.structure != _structure() or self.share or self.factorise:
+            return self._rebuild()
+        if not self.expansions:
+            self.expansions = _infer_expansions(self)
+        stale = []
+        for key in sorted(self.expansions, key=len):
+            if any(key[:end] in stale for end in range(4, len(key), 4)):
+                continue
+            recorded = self.expansions[key]
+            sequent = Sequent(self[key].ant, self[key].con)
+            side, index, _ = sequent.principal
+            if recorded.mode != _mode(recorded.rule) \
+                    or (side, index) != (recorded.side, recorded.index):
+                stale.append(key)
+        parents = {key[:-4] for key in self}
+        stale.extend([key for key, sequent in self.items()
+                      if sequent.complexity and key not in parents
+                      and key not in self.expansions
+                      and not any(key.startswith(kept) for kept in stale)])
+        for key in stale:
+            self._prune_below(key)
+            self[key] = Sequent(self[key].ant, self[key].con)
+            self._expand_below(key)
+        self.root = self['0000']
+        return stale
+
+    def _rebuild(self) -> list:
+        """Expands the whole tree again from its root."""
+        self._prune_below('0000')
+        self.links = {}
+        self.explosions = {}
+        self.exploded = {}
+        self.nodes = {self['0000']: '0000'} if self.share else {}
+        self.structure = _structure()
+        self['0000'] = Sequent(self.root.ant, self.root.con)
+        self.root = self['0000']
+        self.populate()
+        return ['0000']
+
+    def _undo(self, key: str, pruned: int, has_been_truncated: bool) -> None:
+        """Undoes a decomposition of the sequent at key that was
+        interrupted part way through."""
+        self._prune_below(key)
+        self.explosions.pop(key, None)
+        if self.exploded.get(self[key]) == key:
+            del self.exploded[self[key]]
+        for link in [k for k in self.links if k.startswith(key)]:
+            del self.links[link]
+        for sequent in [s for s, k in self.nodes.items() if k.startswith(key) and k != key]:
+            del self.nodes[sequent]
+        self.pruned = pruned
+        self.has_been_truncated = has_been_truncated
+
+    def _prune_below(self, key: str) -> None:
+        """Removes everything under key."""
+        for descendant in [k for k in self if k.startswith(key) and k != key]:
+            del self[descendant]
+        for descendant in [k for k in self.expansions if k.startswith(key)]:
+            del self.expansions[descendant]
+
+    def _expand_below(self, key: str) -> None:
+        """Fully expands the sequent at key."""
+        pending = [key]
+        while pending:
+            parent = pending.pop()
+            if not self[parent].complexity:
+                continue
+            new_items = self._decompose(parent, self[parent])
+            self.update(new_items)
+            pending.extend(new_items)
+
+    def locations(self):
+        """Generates (key, sequent) for every location in the tree,
+        including the subtrees of children that were factorised out.
+        Unfactorised trees are generated in their own order, factorised
+        ones level by level."""
+        if not self.links:
+            yield from self.items()
+            return
+        children = {}
+        for key in sorted(list(self.leaves) + list(self.links)):
+            if key != '0000':
+                children.setdefault(key[:-4], []).append(key)
+        pending = deque([('0000', '0000')])
+        while pending:
+            source, target = pending.popleft()
+            yield target, self[source]
+            for child in children.get(source, []):
+                pending.append((self.links.get(child, child),
+                                target + child[len(source):]))
+
+    def resolve(self, key: str) -> Sequent:
+        """Returns the sequent at key, following links to shared
+        subtrees."""
+        location = key[:4]
+        for index in range(4, len(key), 4):
+            location = self.links.get(location + key[index:index + 4],
+                                      location + key[index:index + 4])
+        return self[location]
+
+    def unfold(self) -> dict:
+        """Returns every location in the tree as a dictionary."""
+        return dict(self.locations())
 
     def fill_with(self, dictionary) -> None:
         """Fills the tree with the values in the input dictionary."""
@@ -69,37 +321,184 @@ class Tree(MutableMapping):
 
     def _decompose(self, key: str, sequent: Sequent) -> dict:
         """Returns the results of decomposing a sequent as a dictionary
-        with keys matching their locations in the tree. If reflexivity
-        is off, deletes reflexive results and marks the tree as having
-        been truncated."""
+        with keys matching their locations in the tree. Children
+        rejected by self.vetoes (or reflexive ones, if reflexivity is
+        off) are pruned before they are built. Pruning marks the tree
+        as having been truncated and is counted in self.pruned. With
+        contraction or permutation on, cognates equal to an earlier one
+        are left out. A factorised sequent that has already exploded
+        elsewhere is not decomposed again (see _relinked)."""
         new_items = {}
-        children: tuple = sequent.decompose()
-        if sequent.principal.proposition.is_invertible:
-            new_items.update(_invertible_decomp(children, key))
+        links = {}
+        side, index, proposition = sequent.principal
+        rule = sides[side] + proposition.symbol
+        self.expansions[key] = expansion(rule, _mode(rule), side, index)
+        if proposition.is_invertible:
+            new_items.update(_invertible_decomp(sequent.decompose(self._vetoes()), key))
         else:
-            new_items.update(_non_invertible_decomp(children, key))
-        if not Settings()['Reflexivity']:
-            for new_key, new_sequent in new_items.items():
-                if new_sequent.is_reflexive:
-                    del new_items[new_key]
-                    if not self.has_been_truncated:
-                        self.has_been_truncated = True
+            collapse = Settings().get("Contraction") or Settings().get("Permutation")
+            if self.factorise and proposition.is_explosive and proposition.arity == 2:
+                first = self.exploded.setdefault(sequent, key)
+                if first == key:
+                    results, links, self.explosions[key] = _factorised_decomp(
+                        sequent.decompose(self._vetoes()), key, collapse)
+                else:
+                    self.explosions[key] = self.explosions[first]
+                    results, links = _relinked(self.explosions[first], key)
+                new_items.update(results)
+            else:
+                new_items.update(_non_invertible_decomp(
+                    sequent.decompose(self._vetoes()), key, collapse))
+        pruned = [new_key for new_key, new_sequent in new_items.items()
+                  if new_sequent is None]
+        for new_key in pruned:
+            del new_items[new_key]
+        if pruned:
+            self.pruned += len(pruned)
+            self.has_been_truncated = True
+        if self.share:
+            self._share(new_items)
+        self.links.update({link: self.links.get(kept, kept)
+                           for link, kept in links.items()})
         return new_items
 
+    def _share(self, new_items: dict) -> None:
+        """Replaces the new items equal to a sequent already in the
+        tree with links to it."""
+        for new_key, new_sequent in list(new_items.items()):
+            kept = self.nodes.setdefault(new_sequent, new_key)
+            if kept != new_key:
+                self.links[new_key] = kept
+                del new_items[new_key]
+
+    def _vetoes(self) -> list:
+        """Returns the vetoes to prune this tree's children with."""
+        if not Settings()['Reflexivity']:
+            return self.vetoes + [is_reflexive]
+        return self.vetoes
+
 
-def _non_invertible_decomp(children: tuple, key: str) -> dict:
-    """Returns the results of decomposing non-invertible sequents."""
+def resume(path: str, vetoes=()) -> Tree:
+    """Returns the tree saved to path by Tree.save(). The tree must be
+    resumed with the settings and vetoes it was saved with."""
+    with open(path, "r") as file:
+        state = json.load(file)
+    if state["settings"] != repr(Settings().fingerprint()):
+        raise ValueError(f"The tree in {path} was saved with different settings.")
+    leaves = state["leaves"]
+    tree = Tree(leaves['0000'], vetoes=vetoes, factorise=state["factorise"],
+                share=state["share"])
+    tree.fill_with(leaves)
+    tree.root = tree['0000']
+    tree.pruned = state["pruned"]
+    tree.has_been_truncated = state["has_been_truncated"]
+    tree.links = state["links"]
+    tree.explosions = {key: explosion(tuple(lefts), tuple(rights),
+                                      tuple(tuple(pairing) for pairing in pairings))
+                       for key, (lefts, rights, pairings) in state["explosions"].items()}
+    tree.expansions = {key: expansion(*recorded)
+                       for key, recorded in state["expansions"].items()}
+    for key, (lefts, rights, _) in tree.explosions.items():
+        if all(kept.startswith(key) for kept in lefts + rights):
+            tree.exploded.setdefault(tree[key], key)
+    if tree.share:
+        tree.nodes = {sequent: key for key, sequent in tree.items()}
+    return tree
+
+
+def _structure() -> tuple:
+    """Returns the settings other than connective rules that trees
+    depend on."""
+    return tuple(bool(Settings().get(rule))
+                 for rule in ("Contraction", "Reflexivity", "Permutation"))
+
+
+def _mode(rule: str):
+    """Returns the current mode of rule (None for quantifiers)."""
+    return Settings()["Sequent Rules"].get(rule)
+
+
+def _infer_expansions(tree) -> dict:
+    """Returns the expansions of an imported tree, taking each expanded
+    sequent's current principal and the mode its children's cognates
+    point to (invertible for "000")."""
+    cognates = {}
+    for key in tree:
+        if key != '0000':
+            cognates.setdefault(key[:-4], set()).add(key[-4:-1])
+    expansions = {}
+    for key, found in cognates.items():
+        side, index, proposition = tree[key].principal
+        rule = sides[side] + proposition.symbol
+        mode = _mode(rule)
+        if mode in ("Add", "Mult"):
+            is_invertible = "000" in found
+            invertible_mode = "Add" if rule in two_parent else "Mult"
+            other_mode = "Mult" if invertible_mode == "Add" else "Add"
+            mode = invertible_mode if is_invertible else other_mode
+        expansions[key] = expansion(rule, mode, side, index)
+    return expansions
+
+
+def _limit_reached(nodes, max_nodes, max_memory, max_seconds, started) -> bool:
+    """Whether any of Tree.expand()'s limits has been reached."""
+    if max_nodes is not None and nodes >= max_nodes:
+        return True
+    if max_seconds is not None and time.monotonic() - started >= max_seconds:
+        return True
+    if max_memory is not None and _resident_memory() >= max_memory:
+        return True
+    return False
+
+
+def _resident_memory() -> int:
+    """Returns the current resident memory of this process in bytes.
+    Where that can't be read (anywhere but Linux) it returns the peak
+    resident memory so far instead, which never goes down, or 0 where
+    neither can be measured."""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+scores = {
+    "complexity": lambda key, sequent: sequent.complexity,
+    "branches": lambda key, sequent: principal_branches(sequent),
+    "depth": lambda key, sequent: -len(key),
+}
+
+
+def _non_invertible_decomp(children: tuple, key: str, collapse=False) -> dict:
+    """Returns the results of decomposing non-invertible sequents. If
+    collapse is true, repeated cognates are only kept the first time."""
     cognates = generate_cognates()
     results = {}
+    seen = set()
     if len(children[0]) == 1:
         for dimension in children:
             result: Sequent = dimension[0]
             cognate = next(cognates)
+            if collapse:
+                if dimension in seen:
+                    continue
+                seen.add(dimension)
             new_key = key + cognate + "M"
             results.update({new_key: result})
     else:
         for dimension in children:
             cognate = next(cognates)
+            if collapse:
+                if dimension in seen:
+                    continue
+                seen.add(dimension)
             left, right = dimension
             left_key = key + cognate + "L"
             right_key = key + cognate + "R"
@@ -107,6 +506,61 @@ def _non_invertible_decomp(children: tuple, key: str) -> dict:
     return results
 
 
+def _factorised_decomp(children: tuple, key: str, collapse=False) -> tuple:
+    """Returns the results of decomposing a multiplicative two-parent
+    explosion, keeping each distinct left and right child only under
+    the first cognate it shows up in. Also returns the links from the
+    keys of the children left out to the keys of the ones kept, and
+    the explosion: the keys of the distinct left and right children
+    and, for every cognate, the indices of its pair (None if pruned)."""
+    cognates = generate_cognates()
+    results = {}
+    links = {}
+    distinct = {"L": {}, "R": {}}
+    pairings = []
+    seen = set()
+    for dimension in children:
+        cognate = next(cognates)
+        if collapse:
+            if dimension in seen:
+                continue
+            seen.add(dimension)
+        pair = []
+        for location, child in zip(("L", "R"), dimension):
+            child_key = key + cognate + location
+            if child is None:
+                results[child_key] = None
+                pair.append(None)
+                continue
+            kept = distinct[location]
+            if child in kept:
+                links[child_key] = kept[child][1]
+            else:
+                kept[child] = len(kept), child_key
+                results[child_key] = child
+            pair.append(kept[child][0])
+        pairings.append((cognate, *pair))
+    lefts = tuple(kept_key for _, kept_key in distinct["L"].values())
+    rights = tuple(kept_key for _, kept_key in distinct["R"].values())
+    return results, links, explosion(lefts, rights, tuple(pairings))
+
+
+def _relinked(first: explosion, key: str) -> tuple:
+    """Returns the results and links of exploding a sequent at key
+    that has already exploded as first: its children are links to the
+    ones first kept, and the ones first pruned are pruned again."""
+    results = {}
+    links = {}
+    for cognate, *pair in first.pairings:
+        for location, kept, index in zip(("L", "R"), (first.lefts, first.rights), pair):
+            child_key = key + cognate + location
+            if index is None:
+                results[child_key] = None
+            else:
+                links[child_key] = kept[index]
+    return results, links
+
+
 def _invertible_decomp(children: tuple, key: str) -> dict:
     """Returns results of decomposing invertible sequents."""
     if len(children[0]) == 1:
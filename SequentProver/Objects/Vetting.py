@@ -0,0 +1,165 @@
+"""
+This module keeps track of which atomic sequents have been vetted as
+acceptable or unacceptable, and rejects unacceptable ones while trees
+are being decomposed.
+
+Vetted atoms are stored in Vetted.json as {"Accepted": [...],
+"Rejected": [...]}. A Vetter loads them once and its veto can be handed
+to a Tree (see Tree's vetoes), which then prunes every child that would
+be a rejected atom before it is built. Since no derivation goes through
+a rejected premise, its siblings (the other children of its cognate, or
+of its invertible parent) are pruned with it and their subtrees are
+never grown either (see Sequent.decompose). Compound children are never
+vetoed themselves.
+
+Lookups go through a BloomFilter first. It only knows which atoms (and
+on which side) make up each rejected sequent, so it answers "definitely
+not rejected" for almost every child without building a Sequent, and
+the few children it lets through are checked exactly.
+"""
+
+import json
+import math
+import os
+
+from Objects.Sequents import Sequent
+from Propositions.Converters import String
+
+_current_dir = os.path.dirname(__file__)
+_vetted_path = os.path.join(_current_dir, "..", "data", "Vetted.json")
+_atoms_path = os.path.join(_current_dir, "..", "data", "Atoms.json")
+
+
+class BloomFilter:
+    """A set that can only be added to and whose membership test has
+    no false negatives, but some false positives (error_rate of them
+    when it holds capacity items)."""
+
+    __slots__ = ["size", "hashes", "bits", "_count"]
+
+    def __init__(self, capacity=1000, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, item) -> bool:
+        for index in self._indices(item):
+            if not self.bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    def add(self, item) -> None:
+        for index in self._indices(item):
+            self.bits[index >> 3] |= 1 << (index & 7)
+        self._count += 1
+
+    def _indices(self, item):
+        """Generates the bits item sets (by double hashing)."""
+        first = hash(item)
+        second = hash((first, "bloom")) | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+
+class Vetter:
+
+    def __init__(self, path=_vetted_path, bloom=True):
+        self.path = path
+        vetted = load(path)
+        self.accepted = {String(atom).to_sequent() for atom in vetted["Accepted"]}
+        self.rejected = {String(atom).to_sequent() for atom in vetted["Rejected"]}
+        self.bloom = None
+        if bloom:
+            self.bloom = BloomFilter(capacity=len(self.rejected))
+            for sequent in self.rejected:
+                self.bloom.add(_signature(sequent.ant, sequent.con))
+
+    def __repr__(self):
+        return f"Vetter({len(self.accepted)} accepted, {len(self.rejected)} rejected)"
+
+    def __bool__(self) -> bool:
+        return bool(self.rejected)
+
+    def is_vetted(self, sequent: Sequent) -> bool:
+        return sequent in self.accepted or sequent in self.rejected
+
+    def veto(self, antecedent, consequent) -> bool:
+        """Veto for rejected atoms: whether antecedent |~ consequent is
+        atomic and has been rejected."""
+        for prop in antecedent:
+            if prop.complexity:
+                return False
+        for prop in consequent:
+            if prop.complexity:
+                return False
+        if self.bloom is not None \
+                and _signature(antecedent, consequent) not in self.bloom:
+            return False
+        return Sequent(antecedent, consequent) in self.rejected
+
+    def accept(self, sequent: Sequent) -> None:
+        self.rejected.discard(sequent)
+        self.accepted.add(sequent)
+
+    def reject(self, sequent: Sequent) -> None:
+        self.accepted.discard(sequent)
+        self.rejected.add(sequent)
+        if self.bloom is not None:
+            self.bloom.add(_signature(sequent.ant, sequent.con))
+
+    def save(self) -> None:
+        write({"Accepted": sorted(str(s) for s in self.accepted),
+               "Rejected": sorted(str(s) for s in self.rejected)}, self.path)
+
+
+def _signature(antecedent, consequent) -> frozenset:
+    """Returns the atoms of a sequent tagged with their side, which
+    doesn't depend on their order or repetition."""
+    signature = {(0, prop) for prop in antecedent}
+    signature.update((1, prop) for prop in consequent)
+    return frozenset(signature)
+
+
+def load(path=_vetted_path) -> dict:
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def write(vetted, path=_vetted_path) -> None:
+    with open(path, "w") as file:
+        file.write(json.dumps(vetted, indent=4))
+
+
+def view() -> None:
+    vetted = load()
+    for verdict in ("Accepted", "Rejected"):
+        print(f"{verdict} atoms:")
+        for atom in vetted[verdict]:
+            print(f"\t{atom}")
+
+
+def vet() -> None:
+    """Asks whether each atom in Atoms.json that hasn't been vetted yet
+    is acceptable."""
+    vetter = Vetter(bloom=False)
+    with open(_atoms_path, "r") as file:
+        atoms = [String(atom).to_sequent() for atom in json.load(file)]
+    try:
+        for atom in atoms:
+            if vetter.is_vetted(atom):
+                continue
+            answer = input(f"{atom}\nAccept (a), reject (r), skip (s) "
+                           f"or stop (q)?\n").strip().lower()
+            if answer == "a":
+                vetter.accept(atom)
+            elif answer == "r":
+                vetter.reject(atom)
+            elif answer == "q":
+                break
+    finally:
+        vetter.save()
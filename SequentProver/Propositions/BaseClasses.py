@@ -15,6 +15,8 @@ class Unary(Proposition):
     arity: int = 1
     string: str = None
     symbol: str = None
+    _hash = None
+    _string = None
 
     def __init__(self, prop) -> None:
         super().__init__()
@@ -24,7 +26,9 @@ class Unary(Proposition):
         return f"{self.__class__.__name__}({self.prop})"
 
     def __str__(self) -> str:
-        return f"({self.string} {self.prop})"
+        if self._string is None:
+            self._string = f"({self.string} {self.prop})"
+        return self._string
 
     def __iter__(self):
         yield self.prop
@@ -35,6 +39,11 @@ class Unary(Proposition):
                 return True
         return False
 
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.__class__, self.prop))
+        return self._hash
+
     def __ne__(self, other):
         if self == other:
             return False
@@ -68,6 +77,8 @@ class Binary(Proposition):
     string: str = None
     symbol: str = None
     _names = None
+    _hash = None
+    _string = None
 
     def __init__(self, left, right) -> None:
         self._left = left
@@ -77,7 +88,9 @@ class Binary(Proposition):
         return f"{self.__class__.__name__}({self.left}, {self.right})"
 
     def __str__(self) -> str:
-        return f"({self.left} {self.string} {self.right})"
+        if self._string is None:
+            self._string = f"({self.left} {self.string} {self.right})"
+        return self._string
 
     def __iter__(self):
         yield self.left
@@ -89,6 +102,11 @@ class Binary(Proposition):
                 return True
         return False
 
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.__class__, self.left, self.right))
+        return self._hash
+
     def __ne__(self, other):
         if self == other:
             return False
@@ -132,6 +150,8 @@ class Quantifier(Proposition):
     string: str = None
     symbol: str = None
     _names: list = None
+    _hash = None
+    _string = None
     __slots__ = ("_var", "_prop")
 
     def __init__(self, var, prop) -> None:
@@ -142,7 +162,9 @@ class Quantifier(Proposition):
         return f"{self.__class__.__name__}({self.var}, {self.prop})"
 
     def __str__(self) -> str:
-        return f"{self.symbol}({self.var})({self.prop})"
+        if self._string is None:
+            self._string = f"{self.symbol}({self.var})({self.prop})"
+        return self._string
 
     def __len__(self) -> int:
         return 1
@@ -160,6 +182,13 @@ class Quantifier(Proposition):
                 return True
         return False
 
+    def __hash__(self) -> int:
+        # Equal quantifiers only differ in the name of their variable,
+        # so hash them with it replaced by a name nothing else can have.
+        if self._hash is None:
+            self._hash = hash((self.__class__, self.instantiate(self.var, "")))
+        return self._hash
+
     def __ne__(self, other) -> bool:
         if self == other:
             return False
@@ -205,6 +234,7 @@ class Atom(Proposition):
     """
     arity: int = 0
     complexity: int = 0
+    _hash = None
     __slots__ = ("_prop", "_names")
 
     def __init__(self, prop: str, *names: Sequence):
@@ -221,15 +251,21 @@ class Atom(Proposition):
         return str(self)
 
     def __eq__(self, other):
-        if self.prop == other.prop and self.names == other.names:
+        if self.__class__ == other.__class__ and self.prop == other.prop \
+                and self.names == other.names:
             return True
         return False
 
     def __ne__(self, other):
-        if self.prop == other.prop:
+        if self == other:
             return False
         return True
 
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.prop, self.names))
+        return self._hash
+
     # Strictly speaking, this should be called "predicate" or something
     # but naming it prop allows me to use fewer "if" statements, which
     # is better for everyone in the long run.
@@ -182,9 +182,11 @@ def _word_degree(word) -> int:
 
 
 def _convert_list(cedent: list):
-    """Generates converted propositions (from strings)."""
+    """Generates converted propositions (from strings), skipping empty
+    ones (e.g. the consequent of "A |~ ")."""
     for string in cedent:
-        yield String(string).to_proposition()
+        if string.strip():
+            yield String(string).to_proposition()
 
 
 def _letter_generator():
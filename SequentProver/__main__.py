@@ -1,23 +1,31 @@
 import os      # allows us to deal with directories on the computer
 import shutil   # allows us to write and save files
+import sys      # gives us the command line arguments
 
-from Controllers.Menus.Handlers import main_menu   # gets the menu "Main.json" from data/Menus
 from Controllers.Rules import Settings        # gets the settings of the rules from "Settings.json"
 
 _main_dir = os.path.dirname(__file__)    # sets "_main_dir" to the directory in which this file is running
 _data_path = os.path.join(_main_dir, "data")   # sets "_data_path" to the data folder in "_main_dir"
 _ftue_path = os.path.join(_data_path, "Presets", "FTUE")   # sets "_ftue_path" to ...SequentProver/data/Presets/FTUE
-_untracked_src_files = ("Atoms.json", "Names.json", "Settings.json")  # defines object that we will manipulate
+_untracked_src_files = ("Atoms.json", "Names.json", "Settings.json", "Vetted.json")  # defines object that we will manipulate
 
 
 def main():    # opens the main menu and makes sure the necessary files and folders exist
+    from Controllers.Menus.Handlers import main_menu   # gets the menu "Main.json" from data/Menus
     for file in _untracked_src_files:
-        _initialize_file(file)  # makes sure that we have "Atoms", "Names" and "Settings" in "data" folder
+        _initialize_file(file)  # makes sure that we have "Atoms", "Names", "Settings" and "Vetted" in "data" folder
     _initialize_runs()     # checks whether the "Runs" folder exists and creates it if necessary
     Settings().update_output_file()   # Updates settings and writes output file
     main_menu()     # Prints and activates the main menu
 
 
+def batch(arguments):    # runs without menus when given command line arguments (see Controllers/Batch.py)
+    from Controllers import Batch
+    for file in _untracked_src_files:
+        _initialize_file(file)
+    return Batch.main(arguments)
+
+
 def _initialize_file(file_name):  # checks that we have files in "SequentProver/data" and if not copies from FTUE
     file_path = os.path.join(_data_path, file_name)  # points to the files in "SequentProver/data"
     if not os.path.exists(file_path):
@@ -33,6 +41,8 @@ def _initialize_runs():  # checks whether the "Runs" folder exists and creates i
 # print(os.path.dirname(__file__))  # to see where on your computer the "SequentProver" directory is located
 
 if __name__ == '__main__':    # executes function main() if this code is run from here (as top level)
+    if len(sys.argv) > 1:
+        sys.exit(batch(sys.argv[1:]))   # headless batch mode, e.g. "python __main__.py --help"
     main()
 
 
@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Controllers import Batch
+from Controllers.Settings import Settings
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+_prover_dir = os.path.join(os.path.dirname(__file__), "..", "SequentProver")
+
+
+class TestBatch(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequents = ["A, (A or B) |~ (A and C)", "(A and B) |~ (C implies D)"]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, "input.txt")
+        self.output = os.path.join(self.directory, "output.json")
+        with open(self.input, "w") as file:
+            file.write("\n".join(self.sequents))
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        shutil.rmtree(self.directory)
+
+    def run_batch(self, *arguments):
+        return Batch.main([self.input, "-o", self.output, "--no-cache", *arguments])
+
+    def output_json(self):
+        with open(self.output) as file:
+            return json.load(file)
+
+    def test_runs_match_populate(self):
+        self.assertEqual(Batch.OK, self.run_batch())
+        runs = self.output_json()
+        for string in self.sequents:
+            tree = Tree(string)
+            tree.populate()
+            self.assertEqual({k: str(v) for k, v in tree.items()}, runs[string])
+
+    def test_rule_overrides_apply_to_the_run(self):
+        self.assertEqual(Batch.OK, self.run_batch("--preset", "NonInvertible",
+                                                  "-f", "counts"))
+        counts = self.output_json()
+        self.assertGreater(counts[self.sequents[0]]["derivations"], 1)
+
+    def test_atoms_are_sorted(self):
+        self.assertEqual(Batch.OK, self.run_batch("-f", "atoms", "--jobs", "2"))
+        atoms = self.output_json()
+        self.assertEqual(sorted(set(atoms)), atoms)
+        self.assertIn("A, A |~ A", atoms)
+
+    def test_invertible_atoms_are_joined_without_trees(self):
+        structure = {rule: Settings().get(rule) for rule in Batch._structural_rules}
+        try:
+            for reflexivity in ("on", "off"):
+                with self.subTest(reflexivity=reflexivity), \
+                        patch.object(Batch, "_tree", wraps=Batch._tree) as tree:
+                    self.assertEqual(Batch.OK, self.run_batch(
+                        "-f", "atoms", "--preset", "Invertible", "--structure",
+                        "Permutation=on", "--structure", f"Reflexivity={reflexivity}"))
+                    tree.assert_not_called()
+                    populated = set()
+                    for string in self.sequents:
+                        full = Tree(string)
+                        full.populate()
+                        populated.update(str(s) for s in full.values() if not s.complexity)
+                    self.assertEqual(sorted(populated), self.output_json())
+        finally:
+            Settings().dict.update(structure)
+
+    def test_exit_codes(self):
+        self.assertEqual(Batch.INCOMPLETE, self.run_batch("--max-nodes", "2"))
+        self.assertEqual(Batch.INCOMPLETE, self.run_batch("--node-budget", "1"))
+        self.assertEqual(Batch.ERROR, self.run_batch("--rule", "L&=Both"))
+        self.assertEqual(Batch.ERROR, self.run_batch("--structure", "Cut=on"))
+        self.assertEqual(Batch.ERROR, Batch.main(["missing.txt", "-o", self.output]))
+        csv = os.path.join(self.directory, "input.csv")
+        shutil.copy(self.input, csv)
+        self.assertEqual(Batch.ERROR, Batch.main([csv, "-o", self.output]))
+
+    def test_checkpoints_are_resumed(self):
+        checkpoints = os.path.join(self.directory, "checkpoints")
+        self.assertEqual(Batch.OK, self.run_batch())
+        with open(self.output) as file:
+            expected = file.read()
+        tree = Tree(String(self.sequents[0]).to_sequent(), factorise=True, share=True)
+        tree.save(Batch._checkpoint(tree.root, checkpoints))
+        self.assertEqual(Batch.OK, self.run_batch("--checkpoints", checkpoints))
+        with open(self.output) as file:
+            self.assertEqual(expected, file.read())
+        self.assertEqual([], os.listdir(checkpoints))
+
+    def test_unusable_checkpoints_start_over(self):
+        checkpoints = os.path.join(self.directory, "checkpoints")
+        self.assertEqual(Batch.OK, self.run_batch())
+        with open(self.output) as file:
+            expected = file.read()
+        tree = Tree(String(self.sequents[0]).to_sequent(), factorise=True, share=True)
+        tree.save(Batch._checkpoint(tree.root, checkpoints))
+        self.assertEqual(Batch.OK, self.run_batch("--checkpoints", checkpoints,
+                                                  "--rule", "L&=Mult"))
+        with open(Batch._checkpoint(tree.root, checkpoints), "w") as file:
+            file.write("{")
+        self.assertEqual(Batch.OK, self.run_batch("--checkpoints", checkpoints))
+        with open(self.output) as file:
+            self.assertEqual(expected, file.read())
+
+    def test_headless_run_skips_menus_and_settings_file(self):
+        with open(os.path.join(_prover_dir, "data", "Settings.json")) as file:
+            settings = file.read()
+        script = ("import sys; sys.argv = ['__main__.py', *sys.argv[1:]]; "
+                  "import runpy\n"
+                  "try:\n"
+                  "    runpy.run_path('__main__.py', run_name='__main__')\n"
+                  "except SystemExit as exit_:\n"
+                  "    assert 'tkinter' not in sys.modules\n"
+                  "    assert 'Controllers.Menus.Handlers' not in sys.modules\n"
+                  "    raise")
+        process = subprocess.run(
+            [sys.executable, "-c", script, self.input, "-o", self.output,
+             "--no-cache", "--rule", "L&=Add", "--structure", "Reflexivity=off"],
+            cwd=_prover_dir, env={**os.environ, "PYTHONPATH": "."},
+            capture_output=True, text=True)
+        self.assertEqual(Batch.OK, process.returncode, process.stderr)
+        with open(os.path.join(_prover_dir, "data", "Settings.json")) as file:
+            self.assertEqual(settings, file.read())
+        self.assertEqual(set(self.sequents), set(self.output_json()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from Controllers.Caches import Cache
+from Controllers.Settings import Settings
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestCache(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequents = ["(A and B), (C or D) |~ (E implies F)",
+                "(A or B), C, C |~ E, E",
+                "A |~ (not B)"]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def populated(self, string, **options):
+        tree = Tree(string, **options)
+        tree.populate()
+        return tree
+
+    def test_cached_trees_match_populated_ones(self):
+        cache = Cache(self.directory)
+        for string in self.sequents:
+            cache.put(self.populated(string, factorise=True, share=True))
+        for string in self.sequents:
+            self.assertEqual(self.populated(string), cache.get(sequent(string)))
+        self.assertEqual(3, cache.hits)
+        self.assertEqual("Cache: 3 of 3 trees reused (100%).", cache.report())
+
+    def test_rule_changes_miss(self):
+        cache = Cache(self.directory)
+        cache.put(self.populated(self.sequents[0]))
+        Settings()["Sequent Rules"]["L&"] = "Add"
+        self.assertIsNone(Cache(self.directory).get(sequent(self.sequents[0])))
+
+    def test_principal_order_changes_miss(self):
+        cache = Cache(self.directory)
+        with patch.dict(Settings().dict, {"Principal Strategy": "User Order",
+                                          "Principal Order": ["L&", "Rv"]}):
+            cache.put(self.populated(self.sequents[0]))
+            self.assertIn(sequent(self.sequents[0]), Cache(self.directory))
+            Settings().dict["Principal Order"] = ["Rv", "L&"]
+            self.assertIsNone(Cache(self.directory).get(sequent(self.sequents[0])))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = Cache(self.directory)
+        for age, string in enumerate(self.sequents):
+            cache.put(self.populated(string))
+            path = cache._path(sequent(string))
+            os.utime(path, (1000 - age, 1000 - age))
+        sizes = {string: os.path.getsize(cache._path(sequent(string)))
+                 for string in self.sequents}
+        cache.max_size = sizes[self.sequents[0]] + sizes[self.sequents[1]]
+        self.assertEqual(1, cache.evict())
+        self.assertNotIn(sequent(self.sequents[2]), cache)
+        self.assertIn(sequent(self.sequents[0]), cache)
+
+    def test_concurrent_puts_of_the_same_tree(self):
+        tree = self.populated(self.sequents[0], factorise=True, share=True)
+        for max_size in (None, 1):
+            cache = Cache(self.directory, max_size=max_size)
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(lambda _: Cache(self.directory, max_size).put(tree), range(40)))
+            leftovers = [name for name in os.listdir(self.directory) if name.endswith(".tmp")]
+            self.assertEqual([], leftovers)
+            if max_size is None:
+                self.assertEqual(self.populated(self.sequents[0]), cache.get(tree.root))
+
+    def test_puts_only_scan_when_over_the_bound(self):
+        cache = Cache(self.directory, max_size=10 ** 9)
+        cache.put(self.populated(self.sequents[0]))
+        with patch.object(Cache, "evict") as evict:
+            cache.put(self.populated(self.sequents[1]))
+            evict.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
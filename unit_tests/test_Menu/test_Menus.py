@@ -1,7 +1,9 @@
 import io
 import os
+import sys
 import unittest
 from unittest.mock import patch
+from Controllers.Menus import Base
 from Controllers.Menus.Base import Menu
 
 
@@ -70,6 +72,21 @@ class TestMenus(unittest.TestCase):
         result = self.capture_menu_return_value([3])
         self.assertEqual("TEST_STRING", result)
 
+    def test_file_is_compiled_once(self):
+        self.menu.load(self.mock_file)
+        with patch("builtins.open") as mock_open:
+            Menu(file=self.mock_file)
+            mock_open.assert_not_called()
+        self.assertIn(os.path.getmtime(self.mock_file), Base._tables[self.mock_file])
+
+    def test_packages_are_imported_when_chosen(self):
+        sys.modules.pop("unit_tests.mocks.Objects", None)
+        self.menu.load(self.mock_file)
+        self.assertNotIn("unit_tests.mocks.Objects", sys.modules)
+        result = self.capture_menu_return_value([2])
+        self.assertEqual("test", result.prop)
+        self.assertIn("unit_tests.mocks.Objects", sys.modules)
+
 
 if __name__ == '__main__':
     unittest.main()
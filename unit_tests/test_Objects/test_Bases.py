@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects.Bases import BaseIndex, SetTrie
+from Objects.Provers import Prover, load_base
+from Objects.Sequents import Sequent
+from Objects.Trees import Tree
+from Propositions.BaseClasses import Atom
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestSetTrie(unittest.TestCase):
+    sets = [{1, 2}, {2, 3, 4}, {1}, {5}, set()]
+
+    def test_queries_match_brute_force(self):
+        trie = SetTrie(self.sets[:-1])
+        for query in ({1, 2, 3}, {2, 3, 4, 5}, {4}, {2}, set(), {1, 5}):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    sorted(tuple(sorted(s)) for s in self.sets[:-1] if s <= query),
+                    sorted(trie.subsets(query)))
+                self.assertEqual(
+                    sorted(tuple(sorted(s)) for s in self.sets[:-1] if s >= query),
+                    sorted(trie.supersets(query)))
+
+    def test_membership_is_exact(self):
+        trie = SetTrie(self.sets[:2])
+        self.assertIn({2, 1}, trie)
+        self.assertNotIn({2}, trie)
+        trie.insert({1, 2})
+        self.assertEqual(2, len(trie))
+
+    def test_empty_set_is_a_subset_of_everything(self):
+        self.assertTrue(SetTrie(self.sets).has_subset({7}))
+        self.assertFalse(SetTrie(self.sets[:-1]).has_subset({7}))
+
+
+class TestBaseIndex(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    base = [sequent("A |~ B"), sequent("C, D |~ E")]
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def test_monotonic_licensing(self):
+        index = BaseIndex(self.base)
+        self.assertTrue(index.licenses(sequent("A, C |~ B, D")))
+        self.assertFalse(index.licenses(sequent("B |~ A")))
+        self.assertFalse(index.licenses(sequent("C |~ E")))
+        self.assertEqual([self.base[1]], index.licensing(sequent("D, C, A |~ E")))
+        self.assertEqual([self.base[1]], index.extending(Sequent([Atom("C")], [])))
+
+    def test_membership_depends_on_monotonicity(self):
+        self.assertIn(self.base[0], BaseIndex(self.base))
+        self.assertNotIn(sequent("A, C |~ B"), BaseIndex(self.base))
+        self.assertIn(sequent("A, C |~ B"), BaseIndex(self.base, monotonic=True))
+
+    def test_repeated_atoms_are_counted(self):
+        with patch.dict(Settings().dict, {"Contraction": False}):
+            repeated = sequent("A, A |~ B")
+            self.assertEqual(2, len(repeated.ant))
+            self.assertNotIn(repeated, BaseIndex(self.base))
+            self.assertNotIn(self.base[0], BaseIndex([repeated]))
+            self.assertIn(repeated, BaseIndex([repeated]))
+            self.assertTrue(BaseIndex(self.base).licenses(repeated))
+            self.assertFalse(BaseIndex([repeated]).licenses(self.base[0]))
+            self.assertEqual([repeated], BaseIndex([repeated]).extending(self.base[0]))
+
+    def test_agrees_with_atoms_file(self):
+        base = load_base()
+        index = BaseIndex(base)
+        self.assertEqual(len(base), len(index))
+        for atom in base:
+            self.assertIn(atom, index)
+
+    def test_label_judges_every_leaf(self):
+        Rules.change_multiple("", "Invertible")
+        tree = Tree(sequent("(A or C), D |~ B, E"))
+        tree.populate()
+        labels = BaseIndex(self.base, monotonic=True).label(tree)
+        self.assertEqual({"0000000L": True, "0000000R": True}, labels)
+
+    def test_prover_accepts_index_as_base(self):
+        Rules.change_multiple("", "Invertible")
+        root = sequent("(A or C), D |~ B, E")
+        self.assertFalse(Prover(BaseIndex(self.base)).is_derivable(root))
+        self.assertTrue(Prover(BaseIndex(self.base, monotonic=True)).is_derivable(root))
+
+
+if __name__ == '__main__':
+    unittest.main()
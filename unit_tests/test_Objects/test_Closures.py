@@ -0,0 +1,74 @@
+import unittest
+from collections import Counter
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects.Closures import Closures
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+def tree_leaves(root):
+    tree = Tree(root)
+    tree.populate()
+    return [leaf for leaf in tree.values() if not leaf.complexity]
+
+
+def contents(leaves):
+    return Counter((tuple(sorted(map(str, leaf.ant))), tuple(sorted(map(str, leaf.con))))
+                   for leaf in leaves)
+
+
+class TestClosures(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    structure = {k: Settings().get(k) for k in ("Reflexivity", "Permutation", "Contraction")}
+    sequents = ["(A and B), (C or D) |~ (E implies F)",
+                "(A or (B and (not C))) |~ (A or C), (not (D and E))",
+                "((A implies B) implies C), (B or (not A)) |~ (C and (A or B))",
+                "(A or B), (C or D), (E or F) |~ (A and C)"]
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        Settings().dict.update(self.structure)
+
+    def test_leaves_match_tree(self):
+        Rules.change_multiple("", "Invertible")
+        for reflexivity in (True, False):
+            Settings().dict["Reflexivity"] = reflexivity
+            closures = Closures()
+            for string in self.sequents:
+                with self.subTest(sequent=string, reflexivity=reflexivity):
+                    root = sequent(string)
+                    leaves = closures.leaves(root)
+                    self.assertEqual(contents(tree_leaves(root)), contents(leaves))
+                    self.assertEqual(len(leaves), closures.count_leaves(root))
+
+    def test_leaves_are_exact_with_permutation(self):
+        Rules.change_multiple("", "Invertible")
+        Settings().dict["Permutation"] = True
+        for string in self.sequents:
+            root = sequent(string)
+            self.assertEqual(Counter(tree_leaves(root)), Counter(Closures().leaves(root)))
+
+    def test_non_invertible_rules_fall_back_to_tree(self):
+        Rules.change_multiple("", "NonInvertible")
+        closures = Closures()
+        root = sequent(self.sequents[0])
+        self.assertIsNone(closures.closure(root.ant[0], "ant"))
+        self.assertEqual(tree_leaves(root), closures.leaves(root))
+
+    def test_closures_are_shared(self):
+        Rules.change_multiple("", "Invertible")
+        closures = Closures()
+        closures.leaves(sequent("(A or B) |~ C"))
+        closures.leaves(sequent("D, (A or B) |~ (A or B)"))
+        self.assertEqual(8, len(closures.tables[Settings().fingerprint()]))
+
+
+if __name__ == '__main__':
+    unittest.main()
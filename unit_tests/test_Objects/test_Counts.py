@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Controllers import Rules
+from Controllers.ImportExport import Decompose
+from Controllers.Settings import Settings
+from Objects.Counts import TreeCounter
+from Objects.Trees import Tree
+from Objects.Vetting import Vetter
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestTreeCounter(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    structure = {k: Settings().get(k) for k in ("Reflexivity", "Permutation", "Contraction")}
+    sequents = ["(A and B), (C or D) |~ (E implies F)",
+                "(A or B), C, C |~ E, E",
+                "(A and A), (B or B) |~ (C implies C)",
+                "A, (A or B) |~ (A and C)"]
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        Settings().dict.update(self.structure)
+
+    def test_counts_match_populated_trees(self):
+        for mode in ("Invertible", "NonInvertible"):
+            Rules.change_multiple("", mode)
+            for structure in ("Reflexivity", "Contraction", "Permutation"):
+                Settings().dict.update({"Reflexivity": structure != "Reflexivity",
+                                        "Contraction": structure == "Contraction",
+                                        "Permutation": structure == "Permutation"})
+                counter = TreeCounter()
+                for string in self.sequents:
+                    with self.subTest(sequent=string, mode=mode, structure=structure):
+                        root = sequent(string)
+                        tree = Tree(root)
+                        tree.populate()
+                        counted = counter.count(root)
+                        self.assertEqual(len(tree), counted.nodes)
+                        self.assertEqual(len([s for s in tree.values() if not s.complexity]),
+                                         counted.leaves)
+
+    def test_derivations(self):
+        Rules.change_multiple("", "Invertible")
+        self.assertEqual(1, TreeCounter().count(sequent(self.sequents[0])).derivations)
+        Rules.change_multiple("", "NonInvertible")
+        Settings().dict["Reflexivity"] = True
+        # 3 L& cognates, then 2^2, 2^2 and 2^3 Lv splits
+        self.assertEqual(16, TreeCounter().count(sequent("(A and B), (C or D) |~ E")).derivations)
+
+    def test_sub_sequents_are_memoised(self):
+        Rules.change_multiple("", "Invertible")
+        counter = TreeCounter()
+        counter.count(sequent("(A or B) |~ (A or B)"))
+        self.assertEqual(5, len(counter.memo))
+
+    def test_input_file_counts_use_the_trees_vetoes(self):
+        Rules.change_multiple("", "NonInvertible")
+        Settings().dict["Reflexivity"] = False
+        with tempfile.TemporaryDirectory() as directory:
+            vetted = os.path.join(directory, "Vetted.json")
+            with open(vetted, "w") as file:
+                json.dump({"Accepted": [], "Rejected": ["A |~ C"]}, file)
+            input_file = os.path.join(directory, "input.txt")
+            with open(input_file, "w") as file:
+                file.write("\n".join(self.sequents))
+            with patch("Controllers.ImportExport.Vetter", lambda: Vetter(vetted)):
+                counts = Decompose(input_file).counts()
+            pruned = 0
+            for line, counted in counts:
+                tree = Tree(line, vetoes=[Vetter(vetted).veto])
+                tree.populate()
+                pruned += tree.pruned
+                self.assertEqual(len(tree), counted.nodes)
+            self.assertGreater(pruned, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
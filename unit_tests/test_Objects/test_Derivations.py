@@ -0,0 +1,80 @@
+import unittest
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects.Counts import TreeCounter
+from Objects.Derivations import Derivations
+from Objects.Provers import Prover
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestDerivations(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequent = "(A and B), (C or D) |~ E"
+
+    def setUp(self) -> None:
+        Rules.change_multiple("", "NonInvertible")
+        self.reflexivity = Settings()["Reflexivity"]
+        Settings().dict["Reflexivity"] = True
+        self.tree = Tree(self.sequent)
+        self.tree.populate()
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        Settings().dict["Reflexivity"] = self.reflexivity
+
+    def test_count_matches_counter(self):
+        self.assertEqual(TreeCounter().count(sequent(self.sequent)).derivations,
+                         Derivations(self.tree).count())
+
+    def test_derivations_pick_one_cognate_per_step(self):
+        derivations = list(Derivations(self.tree))
+        self.assertEqual(16, len(derivations))
+        self.assertEqual(16, len({tuple(sorted(d)) for d in derivations}))
+        for derivation in derivations:
+            for key in derivation:
+                self.assertEqual(self.tree[key], derivation[key])
+                children = {child[:-1] for child in derivation if child[:-4] == key}
+                self.assertLessEqual(len(children), 1)
+                if self.tree[key].complexity:
+                    self.assertEqual(1, len(children))
+
+    def test_skipping_matches_iteration(self):
+        derivations = Derivations(self.tree)
+        listed = list(derivations)
+        self.assertEqual(listed[5], derivations[5])
+        self.assertEqual(listed[-1], derivations[-1])
+        self.assertEqual(listed[10:], list(derivations.variants(10)))
+        with self.assertRaises(IndexError):
+            derivations[16]
+
+    def test_cheapest_matches_brute_force(self):
+        derivations = Derivations(self.tree)
+        measures = {
+            "nodes": len,
+            "leaves": lambda d: len([s for s in d.values() if not s.complexity]),
+            "non-invertible": lambda d: len({k[:-4] for k in d if k != '0000'
+                                             and k[-4:-1] != '000'}),
+        }
+        for cost, measure in measures.items():
+            with self.subTest(cost=cost):
+                cheapest = derivations.cheapest(cost)
+                self.assertIn(cheapest, list(derivations))
+                self.assertEqual(min(measure(d) for d in derivations), measure(cheapest))
+
+    def test_prover_witness_is_a_derivation(self):
+        root = sequent("(A or C) |~ B, D")
+        witness = Prover({sequent("A |~ B"), sequent("C |~ D")}).prove(root).witness
+        tree = Tree(root)
+        tree.populate()
+        self.assertIn(witness, list(Derivations(tree)))
+
+
+if __name__ == '__main__':
+    unittest.main()
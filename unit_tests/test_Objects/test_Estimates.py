@@ -0,0 +1,57 @@
+import unittest
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects.Estimates import estimate_sequent, branching_factors
+from Objects.Sequents import Sequent
+from Objects.Trees import Tree
+from Propositions.BaseClasses import Atom
+from Propositions.Converters import String
+from Propositions.Propositions import Conjunction, Conditional, Negation
+from unit_tests.mocks import Objects as mock
+
+
+class TestEstimates(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequents = [
+        "(A and B), (C or D) |~ (E implies F)",
+        "(not (A implies B)) |~ (C and (not D)), E",
+        "(A or B), C, D |~ (E and F)",
+        "((A implies B) implies C) |~ (D or E)",
+    ]
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def test_invertible_single_child_estimate_is_exact(self):
+        Rules.change_multiple("", "Invertible")
+        estimate = estimate_sequent(mock.left_conjunction_sequent)
+        self.assertEqual((2, 1, 1), tuple(estimate))
+
+    def test_negation_flips_side_of_subproposition(self):
+        Rules.change_multiple("", "Invertible")
+        alpha, beta = Atom("alpha"), Atom("beta")
+        sequent = Sequent([Negation(Conjunction(alpha, beta))], [])
+        self.assertEqual([1, 2], branching_factors(sequent))
+
+    def test_conditional_flips_side_of_antecedent(self):
+        Rules.change_multiple("", "NonInvertible")
+        alpha, beta = Atom("alpha"), Atom("beta")
+        sequent = Sequent([], [Conditional(Conjunction(alpha, beta), beta)])
+        self.assertEqual([3, 3], branching_factors(sequent))
+
+    def test_estimates_bound_populated_trees(self):
+        for mode in ("Invertible", "NonInvertible"):
+            Rules.change_multiple("", mode)
+            for string in self.sequents:
+                tree = Tree(String(string).to_sequent())
+                tree.populate()
+                leaves = [s for s in tree.values() if s.complexity == 0]
+                estimate = estimate_sequent(tree.root)
+                self.assertLessEqual(len(tree), estimate.nodes, string)
+                self.assertLessEqual(len(leaves), estimate.leaves, string)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects import Sequents
+from Objects.Bases import BaseIndex
+from Objects.Provers import Prover
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestProver(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    base = {sequent("A |~ B"), sequent("C |~ D")}
+
+    def setUp(self) -> None:
+        self.reflexivity = Settings()["Reflexivity"]
+        Settings().dict["Reflexivity"] = False
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        Settings().dict["Reflexivity"] = self.reflexivity
+
+    def test_atomic_sequents_are_judged_by_base(self):
+        prover = Prover(self.base)
+        self.assertTrue(prover.prove(sequent("A |~ B")).is_derivable)
+        self.assertFalse(prover.prove(sequent("B |~ A")).is_derivable)
+
+    def test_reflexive_atoms_are_derivable_with_reflexivity_on(self):
+        Settings().dict["Reflexivity"] = True
+        self.assertTrue(Prover(self.base).prove(sequent("E |~ E")).is_derivable)
+
+    def test_invertible_children_must_all_be_derivable(self):
+        Rules.change_multiple("", "Invertible")
+        prover = Prover(self.base)
+        self.assertTrue(prover.prove(sequent("A |~ (B and B)")).is_derivable)
+        self.assertFalse(prover.prove(sequent("A |~ (B and D)")).is_derivable)
+
+    def test_one_cognate_suffices_for_non_invertible_sequents(self):
+        Rules.change_multiple("", "NonInvertible")
+        verdict = Prover(self.base).prove(sequent("(E and A) |~ B"))
+        self.assertTrue(verdict.is_derivable)
+        self.assertEqual(sequent("A |~ B"), verdict.witness["0000aabM"])
+        self.assertEqual(2, len(verdict.witness))
+
+    def test_cognates_after_the_witness_are_never_built(self):
+        Rules.change_multiple("", "NonInvertible")
+        root = sequent("A, E, F, G, H, I, J, C |~ (B and D)")
+        self.assertEqual(256, len(root.decompose()))
+        prover = Prover(BaseIndex(self.base, monotonic=True))
+        with patch("Objects.Sequents._child", wraps=Sequents._child) as child:
+            self.assertTrue(prover.is_derivable(root))
+        self.assertEqual(4, child.call_count)
+        self.assertEqual(sequent("C |~ D"), prover.prove(root).witness["0000aabR"])
+
+    def test_witness_is_part_of_the_populated_tree(self):
+        Rules.change_multiple("", "NonInvertible")
+        root = sequent("(A or C) |~ B, D")
+        verdict = Prover(self.base).prove(root)
+        self.assertTrue(verdict.is_derivable)
+        tree = Tree(root)
+        tree.populate()
+        for key, child in verdict.witness.items():
+            self.assertEqual(tree[key], child)
+            if not child.complexity:
+                self.assertIn(child, self.base)
+
+    def test_subgoals_are_tabled(self):
+        Rules.change_multiple("", "Invertible")
+        prover = Prover(self.base)
+        prover.prove(sequent("A |~ (B and B)"))
+        self.assertEqual(2, len(prover.table))
+
+
+if __name__ == '__main__':
+    unittest.main()
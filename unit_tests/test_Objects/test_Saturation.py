@@ -0,0 +1,65 @@
+import unittest
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects.Provers import Prover
+from Objects.Saturation import Saturation
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestSaturation(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    base = {sequent("A |~ B"), sequent("C |~ D")}
+    targets = [sequent(string) for string in (
+        "A |~ B", "B |~ A", "A |~ (B and B)", "A |~ (B and D)",
+        "(E and A) |~ B", "(A or C) |~ B, D", "(A or C) |~ B",
+        "~B |~ ~A", "(A -> B) |~ (C -> D)")]
+
+    def setUp(self) -> None:
+        self.reflexivity = Settings()["Reflexivity"]
+        Settings().dict["Reflexivity"] = False
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        Settings().dict["Reflexivity"] = self.reflexivity
+
+    def test_atomic_sequents_are_judged_by_base(self):
+        verdicts = Saturation(self.base).classify(
+            [sequent("A |~ B"), sequent("B |~ A")])
+        self.assertEqual([True, False], list(verdicts.values()))
+
+    def test_agrees_with_prover(self):
+        for mode in ("Invertible", "NonInvertible"):
+            Rules.change_multiple("", mode)
+            for reflexivity in (False, True):
+                Settings().dict["Reflexivity"] = reflexivity
+                prover = Prover(self.base)
+                verdicts = Saturation(self.base).classify(self.targets)
+                for target, derivable in verdicts.items():
+                    with self.subTest(target=str(target), mode=mode,
+                                      reflexivity=reflexivity):
+                        self.assertEqual(prover.is_derivable(target), derivable)
+
+    def test_targets_can_be_added_later(self):
+        Rules.change_multiple("", "NonInvertible")
+        saturation = Saturation(self.base)
+        saturation.add(self.targets[:3])
+        saturation.add(self.targets[3:])
+        for target in self.targets:
+            self.assertEqual(Prover(self.base).is_derivable(target),
+                             target in saturation)
+
+    def test_shared_sequents_are_collected_once(self):
+        Rules.change_multiple("", "Invertible")
+        saturation = Saturation(self.base)
+        saturation.add([sequent("A |~ (B and B)"), sequent("A |~ (B and B), B")])
+        self.assertEqual(4, len(saturation.universe))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
+import os
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch
 
 from Controllers import Rules
 from Controllers.Settings import Settings
-from Objects.Sequents import Sequent
+from Objects import Sequents
+from Objects.Sequents import Sequent, is_reflexive
+from Objects.Trees import Tree
 from Propositions.Converters import String
 from Propositions.Decomposables import LeftUniversal
 from Propositions.Propositions import Conjunction, Conditional, Disjunction, Negation, Universal, Existential
@@ -152,6 +157,19 @@ class TestNonInvertibleDecomp(unittest.TestCase):
         for k, v in self.rules.items():
             Settings()["Sequent Rules"][k] = v
 
+    def test_reflexive_splits_are_never_built(self):
+        sequent = String("A, B, C, D |~ A, B, (C and D)").to_sequent()
+        children = sequent.decompose()
+        with patch("Objects.Sequents._child", wraps=Sequents._child) as child:
+            pruned = sequent.decompose([is_reflexive])
+        self.assertEqual(len(children), len(pruned))
+        for dimension, pruned_dimension in zip(children, pruned):
+            self.assertEqual([None if c.is_reflexive else c for c in dimension],
+                             list(pruned_dimension))
+        built = sum(c is not None for dimension in pruned for c in dimension)
+        self.assertEqual(built, child.call_count)
+        self.assertLess(built, len(children))
+
     def test_left_universal(self):
         """forall(x)(Predicate(x)) |~"""
 
@@ -220,5 +238,152 @@ class TestNonInvertibleDecomp(unittest.TestCase):
         )
 
 
+class TestPrincipalStrategies(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    alpha = Atom("Predicate", ("alpha",))
+    beta = Atom("Predicate", ("beta",))
+
+    def setUp(self) -> None:
+        Rules.change_multiple("", "NonInvertible")
+        self.sequent_args = (
+            [Conditional(self.alpha, self.beta), Conjunction(self.alpha, self.beta)],
+            [Disjunction(self.alpha, self.beta), Negation(self.beta)]
+        )
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        Settings().dict["Principal Strategy"] = "Leftmost"
+
+    def principal_of(self, strategy):
+        Settings().dict["Principal Strategy"] = strategy
+        principal = Sequent(*self.sequent_args).principal
+        return principal.side, principal.index
+
+    def test_leftmost_strategy(self):
+        self.assertEqual(("ant", 0), self.principal_of("Leftmost"))
+
+    def test_invertible_first_strategy(self):
+        self.assertEqual(("con", 1), self.principal_of("Invertible First"))
+
+    def test_non_explosive_first_strategy(self):
+        self.assertEqual(("ant", 1), self.principal_of("Non-Explosive First"))
+
+    def test_fewest_branches_strategy(self):
+        self.assertEqual(("con", 1), self.principal_of("Fewest Branches"))
+
+    def test_user_order_strategy(self):
+        order = Settings().get("Principal Order")
+        Settings().dict["Principal Order"] = ["Rv", "L&"]
+        try:
+            self.assertEqual(("con", 0), self.principal_of("User Order"))
+        finally:
+            Settings().dict["Principal Order"] = order
+
+
+class TestInheritedMetadata(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequents = [
+        "(A and B), (C or (not A)) |~ (A implies C), B",
+        "(not (A implies B)), C |~ (C and (not D)), A",
+        "A, (A or B), B |~ (A and (B or C))",
+    ]
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def test_children_inherit_correct_metadata(self):
+        for mode in ("Invertible", "NonInvertible"):
+            Rules.change_multiple("", mode)
+            for string in self.sequents:
+                pending = [String(string).to_sequent()]
+                while pending:
+                    sequent = pending.pop()
+                    fresh = Sequent(sequent.ant, sequent.con)
+                    self.assertEqual(fresh.complexity, sequent.complexity)
+                    self.assertEqual(fresh.is_reflexive, sequent.is_reflexive)
+                    if sequent.complexity:
+                        self.assertEqual(fresh.principal[:2], sequent.principal[:2])
+                        children = sequent.decompose()
+                        pruned = sequent.decompose([is_reflexive])
+                        for dimension, pruned_dimension in zip(children, pruned):
+                            pending.extend(dimension)
+                            for child, pruned_child in zip(dimension, pruned_dimension):
+                                self.assertEqual(child.is_reflexive, pruned_child is None)
+
+
+class TestStructuralRules(unittest.TestCase):
+    alpha = Atom("Predicate", ("alpha",))
+    beta = Atom("Predicate", ("beta",))
+
+    def setUp(self) -> None:
+        self.structure = {rule: Settings().get(rule) for rule in ("Contraction", "Permutation")}
+
+    def tearDown(self) -> None:
+        for rule, value in self.structure.items():
+            Settings().dict[rule] = value
+
+    def test_order_matters_without_permutation(self):
+        Settings().dict["Contraction"] = False
+        Settings().dict["Permutation"] = False
+        self.assertNotEqual(Sequent([self.alpha, self.beta], []),
+                            Sequent([self.beta, self.alpha], []))
+
+    def test_permutation_makes_cedents_multisets(self):
+        Settings().dict["Contraction"] = False
+        Settings().dict["Permutation"] = True
+        first = Sequent([self.beta, self.alpha, self.beta], [self.alpha])
+        second = Sequent([self.beta, self.beta, self.alpha], [self.alpha])
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(3, len(first.ant))
+
+    def test_contraction_drops_repeats(self):
+        Settings().dict["Contraction"] = True
+        Settings().dict["Permutation"] = False
+        sequent = Sequent([self.beta, self.alpha, self.beta], [self.alpha, self.alpha])
+        self.assertEqual(Sequent([self.beta, self.alpha], [self.alpha]), sequent)
+
+    def test_equal_cognates_collapse_in_tree(self):
+        Settings().dict["Contraction"] = False
+        Settings().dict["Permutation"] = False
+        sequent = "A, A |~ (B and C)"
+        rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+        Rules.change_multiple("", "NonInvertible")
+        try:
+            ordered = Tree(String(sequent).to_sequent())
+            ordered.populate()
+            Settings().dict["Permutation"] = True
+            permuted = Tree(String(sequent).to_sequent())
+            permuted.populate()
+        finally:
+            for k, v in rules.items():
+                Settings()["Sequent Rules"][k] = v
+        self.assertLess(len(permuted), len(ordered))
+        self.assertEqual(set(ordered.values()), set(permuted.values()))
+
+
+class TestImportTime(unittest.TestCase):
+    # the only project modules importing Objects.Sequents may load
+    budget = {"Controllers", "Controllers.Settings", "Objects", "Objects.Names",
+              "Objects.Sequents", "Objects.Strategies", "Propositions",
+              "Propositions.BaseClasses", "Propositions.Decomposables",
+              "Propositions.Propositions"}
+
+    def test_sequents_import_within_budget(self):
+        script = ("import sys, Objects.Sequents, Controllers.Settings\n"
+                  "print(Controllers.Settings.settings is None)\n"
+                  "print(' '.join(sorted(m for m in sys.modules if m.split('.')[0] in "
+                  "('Controllers', 'Objects', 'Propositions', 'View', 'tkinter'))))")
+        prover_dir = os.path.join(os.path.dirname(__file__), "..", "..", "SequentProver")
+        process = subprocess.run([sys.executable, "-c", script], cwd=prover_dir,
+                                 env={**os.environ, "PYTHONPATH": "."},
+                                 capture_output=True, text=True, check=True)
+        settings_unread, modules = process.stdout.splitlines()
+        self.assertEqual("True", settings_unread)
+        self.assertLessEqual(set(modules.split()), self.budget)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,14 @@
+import os
+import shutil
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from Controllers.Rules import change_multiple
-from Objects.Sequents import Sequent
-from Objects.Trees import Tree
+from Controllers.Settings import Settings
+from Objects.Sequents import Sequent, is_reflexive
+from Objects import Trees
+from Objects.Trees import Tree, resume
 from View.DisplayTrees import Key
 from unit_tests.mocks import Objects as mock
 
@@ -79,6 +85,391 @@ class TestNonInvertibleDecomp(unittest.TestCase):
         self.assertEqual(Sequent([mock.atom], [mock.atom]), test_tree['0000aabR'])
 
 
+class TestBudgetedExpansion(unittest.TestCase):
+    sequent = "(A and B), (C or D) |~ (E implies (F and G))"
+
+    def setUp(self) -> None:
+        change_multiple(rule="", mode="NonInvertible")
+
+    def test_unlimited_expansion_matches_populate(self):
+        for score in ("complexity", "branches", "depth"):
+            populated = Tree(self.sequent)
+            populated.populate()
+            expanded = Tree(self.sequent)
+            expanded.expand(score=score)
+            self.assertEqual(populated, expanded)
+            self.assertFalse(expanded.is_partial)
+
+    def test_node_limit_leaves_well_formed_frontier(self):
+        tree = Tree(self.sequent)
+        tree.expand(max_nodes=10)
+        self.assertTrue(tree.is_partial)
+        self.assertTrue(tree.frontier)
+        parents = {key[:-4] for key in tree}
+        for key, sequent in tree.items():
+            if sequent.complexity and key not in parents:
+                self.assertIn(key, tree.frontier)
+        for key in tree.frontier:
+            self.assertNotIn(key, parents)
+
+    def test_expansion_resumes_from_frontier(self):
+        populated = Tree(self.sequent)
+        populated.populate()
+        tree = Tree(self.sequent)
+        tree.expand(max_nodes=10)
+        tree.expand()
+        self.assertEqual(populated, tree)
+        self.assertEqual([], tree.frontier)
+
+    def test_node_limit_is_never_passed(self):
+        populated = Tree(self.sequent)
+        populated.populate()
+        for max_nodes in range(1, 40, 3):
+            for options in ({}, {"factorise": True, "share": True}):
+                with self.subTest(max_nodes=max_nodes, options=options):
+                    tree = Tree(self.sequent, **options)
+                    tree.expand(max_nodes=max_nodes)
+                    self.assertLessEqual(len(tree), max_nodes)
+                    self.assertTrue(tree.is_partial)
+                    tree.expand()
+                    self.assertEqual(dict(populated), tree.unfold())
+
+    def test_expanded_sequents_are_not_expanded_again(self):
+        reflexivity = Settings()["Reflexivity"]
+        Settings().dict["Reflexivity"] = False
+        try:
+            for sequent in (self.sequent, "(A implies B), (C implies D), (E implies F) |~ G, F"):
+                for options in ({}, {"factorise": True}):
+                    with self.subTest(sequent=sequent, options=options):
+                        populated = Tree(sequent, **options)
+                        populated.populate()
+                        tree = Tree(sequent, **options)
+                        tree.expand(max_nodes=len(populated) // 2)
+                        tree.expand()
+                        self.assertEqual(populated.pruned, tree.pruned)
+                        tree.expand()
+                        self.assertEqual(populated.pruned, tree.pruned)
+                        self.assertEqual(populated, tree)
+        finally:
+            Settings().dict["Reflexivity"] = reflexivity
+
+    def test_time_limit(self):
+        tree = Tree(self.sequent)
+        tree.expand(max_seconds=0)
+        self.assertEqual(['0000'], tree.frontier)
+        self.assertEqual(1, len(tree))
+
+    def test_memory_limit_follows_current_memory(self):
+        populated = Tree(self.sequent)
+        populated.populate()
+        tree = Tree(self.sequent)
+        with patch.object(Trees, "_resident_memory", return_value=2000):
+            tree.expand(max_memory=1000)
+        self.assertEqual(['0000'], tree.frontier)
+        with patch.object(Trees, "_resident_memory", return_value=500):
+            tree.expand(max_memory=1000)
+        self.assertEqual(populated, tree)
+        self.assertGreater(Trees._resident_memory(), 0)
+
+
+class TestPruning(unittest.TestCase):
+    sequent = "A, (A or B) |~ (A and C)"
+
+    def setUp(self) -> None:
+        change_multiple(rule="", mode="NonInvertible")
+        self.reflexivity = Settings()["Reflexivity"]
+
+    def tearDown(self) -> None:
+        Settings().dict["Reflexivity"] = self.reflexivity
+
+    def test_reflexive_children_are_pruned_when_reflexivity_is_off(self):
+        Settings().dict["Reflexivity"] = True
+        full = Tree(self.sequent)
+        full.populate()
+        Settings().dict["Reflexivity"] = False
+        pruned = Tree(self.sequent)
+        pruned.populate()
+        self.assertTrue(pruned.has_been_truncated)
+        self.assertGreater(pruned.pruned, 0)
+        self.assertLess(len(pruned), len(full))
+        for sequent in pruned.values():
+            if sequent is not pruned.root:
+                self.assertFalse(sequent.is_reflexive)
+
+    def test_user_vetoes_prune_children(self):
+        Settings().dict["Reflexivity"] = True
+        tree = Tree(self.sequent, vetoes=[lambda ant, con: not con])
+        tree.populate()
+        self.assertGreater(tree.pruned, 0)
+        for sequent in tree.values():
+            self.assertTrue(sequent.con)
+
+    def test_decompose_marks_pruned_children_as_none(self):
+        sequent = Sequent([mock.atom], [mock.conjunction])
+        children = sequent.decompose([is_reflexive])
+        self.assertEqual((None, Sequent([], [mock.atom])), children[0])
+        children = sequent.decompose([lambda ant, con: bool(ant)])
+        self.assertEqual((None, None), children[0])
+
+
+class TestFactorisedExplosions(unittest.TestCase):
+    sequents = ["(A or B), C, C |~ E, E",
+                "((A or B) or C), D |~ (E and F), G",
+                "A, (B implies C) |~ (D and E), F"]
+
+    def setUp(self) -> None:
+        change_multiple(rule="", mode="NonInvertible")
+        self.reflexivity = Settings()["Reflexivity"]
+
+    def tearDown(self) -> None:
+        Settings().dict["Reflexivity"] = self.reflexivity
+
+    def test_unfolded_tree_matches_populate(self):
+        for reflexivity in (True, False):
+            Settings().dict["Reflexivity"] = reflexivity
+            for sequent in self.sequents:
+                with self.subTest(sequent=sequent, reflexivity=reflexivity):
+                    full = Tree(sequent)
+                    full.populate()
+                    factorised = Tree(sequent, factorise=True)
+                    factorised.populate()
+                    self.assertEqual(dict(full), factorised.unfold())
+                    self.assertEqual(full.pruned, factorised.pruned)
+
+    def test_distinct_children_are_stored_once(self):
+        Settings().dict["Reflexivity"] = True
+        tree = Tree(self.sequents[0], factorise=True)
+        tree.populate()
+        full = Tree(self.sequents[0])
+        full.populate()
+        self.assertLess(len(tree), len(full))
+        lefts, rights, pairings = tree.explosions['0000']
+        self.assertEqual(16, len(pairings))
+        self.assertEqual(9, len(lefts))
+        self.assertEqual(len(lefts), len(set(tree[key] for key in lefts)))
+        self.assertEqual(len(rights), len(set(tree[key] for key in rights)))
+        for cognate, left, right in pairings:
+            self.assertEqual(full['0000' + cognate + 'L'], tree[lefts[left]])
+            self.assertEqual(full['0000' + cognate + 'R'], tree[rights[right]])
+
+    def test_repeated_explosions_share_their_children(self):
+        sequent = "(A implies B), (C implies D), (E implies F) |~ G, F"
+        for reflexivity in (True, False):
+            Settings().dict["Reflexivity"] = reflexivity
+            with self.subTest(reflexivity=reflexivity):
+                full = Tree(sequent)
+                full.populate()
+                tree = Tree(sequent, factorise=True)
+                tree.populate()
+                self.assertEqual(dict(full), tree.unfold())
+                self.assertEqual(full.pruned, tree.pruned)
+                self.assertLess(len(tree.exploded), len(tree.explosions))
+                for key, exploded in tree.explosions.items():
+                    self.assertIs(tree.explosions[tree.exploded[tree[key]]], exploded)
+                directory = tempfile.mkdtemp()
+                try:
+                    partial = Tree(sequent, factorise=True)
+                    partial.expand(max_nodes=len(tree) // 2)
+                    partial.save(os.path.join(directory, "tree.json"))
+                    resumed = resume(os.path.join(directory, "tree.json"))
+                finally:
+                    shutil.rmtree(directory)
+                self.assertEqual(partial.exploded, resumed.exploded)
+                resumed.populate()
+                self.assertEqual(dict(full), resumed.unfold())
+
+    def test_unfactorised_trees_keep_their_order(self):
+        tree = Tree(self.sequents[0])
+        tree.populate()
+        self.assertEqual(list(tree.items()), list(tree.locations()))
+
+
+class TestSharedTrees(unittest.TestCase):
+    sequents = ["(A or B), C, C |~ E, E",
+                "(A and A), (B or B) |~ (C implies C)",
+                "((A or B) or C), D |~ (E and F), G"]
+
+    def setUp(self) -> None:
+        self.reflexivity = Settings()["Reflexivity"]
+
+    def tearDown(self) -> None:
+        Settings().dict["Reflexivity"] = self.reflexivity
+
+    def test_unfolded_tree_matches_populate(self):
+        for mode in ("Invertible", "NonInvertible"):
+            change_multiple(rule="", mode=mode)
+            for reflexivity in (True, False):
+                Settings().dict["Reflexivity"] = reflexivity
+                for sequent in self.sequents:
+                    with self.subTest(sequent=sequent, mode=mode,
+                                      reflexivity=reflexivity):
+                        full = Tree(sequent)
+                        full.populate()
+                        shared = Tree(sequent, factorise=True, share=True)
+                        shared.populate()
+                        self.assertEqual(dict(full), shared.unfold())
+                        for key, child in full.items():
+                            self.assertEqual(child, shared.resolve(key))
+
+    def test_pruned_counts_the_stored_tree(self):
+        sequent = "((not A) implies C) |~ (A and (C and B)), (B and (A implies A))"
+        rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+        Settings()["Sequent Rules"].update({"L->": "Mult", "R->": "Add", "L&": "Mult",
+                                            "R&": "Mult", "Lv": "Add", "Rv": "Add"})
+        Settings().dict["Reflexivity"] = False
+        try:
+            full = Tree(sequent)
+            full.populate()
+            for options in ({"factorise": True}, {"share": True}):
+                with self.subTest(options=options):
+                    tree = Tree(sequent, **options)
+                    tree.populate()
+                    self.assertEqual(dict(full), tree.unfold())
+                    self.assertTrue(0 < tree.pruned < full.pruned)
+        finally:
+            Settings()["Sequent Rules"].update(rules)
+
+    def test_distinct_sequents_are_stored_once(self):
+        change_multiple(rule="", mode="NonInvertible")
+        Settings().dict["Reflexivity"] = True
+        tree = Tree(self.sequents[1], share=True)
+        tree.populate()
+        full = Tree(self.sequents[1])
+        full.populate()
+        self.assertEqual(len(set(full.values())), len(tree))
+        self.assertEqual(len(tree), len(tree.nodes))
+        self.assertLess(len(tree), len(full))
+
+
+class TestRefresh(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequent = "(A and B), (C or D) |~ (E implies (F and G))"
+
+    def setUp(self) -> None:
+        change_multiple(rule="", mode="Invertible")
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def assert_refreshes_to_populate(self, tree):
+        populated = Tree(self.sequent)
+        populated.populate()
+        self.assertEqual(populated, tree)
+
+    def test_only_stale_subtrees_are_re_expanded(self):
+        tree = Tree(self.sequent)
+        tree.populate()
+        kept = tree['0000']
+        Settings()["Sequent Rules"]["Lv"] = "Mult"
+        stale = tree.refresh()
+        self.assertEqual(['0000000M'], stale)
+        self.assertIs(kept, tree['0000'])
+        self.assert_refreshes_to_populate(tree)
+
+    def test_unchanged_rules_re_expand_nothing(self):
+        tree = Tree(self.sequent)
+        tree.populate()
+        self.assertEqual([], tree.refresh())
+
+    def test_imported_trees_infer_their_expansions(self):
+        tree = Tree(self.sequent)
+        tree.populate()
+        imported = Tree(self.sequent, source={k: str(v) for k, v in tree.items()})
+        Settings()["Sequent Rules"]["R&"] = "Mult"
+        imported.refresh()
+        self.assert_refreshes_to_populate(imported)
+
+    def test_imported_trees_re_check_fully_pruned_sequents(self):
+        reflexivity = Settings()["Reflexivity"]
+        Settings().dict["Reflexivity"] = False
+        try:
+            for sequent in ("A |~ (A or B)", "A, (C and D) |~ (A or B)"):
+                with self.subTest(sequent=sequent):
+                    change_multiple(rule="", mode="Invertible")
+                    tree = Tree(sequent)
+                    tree.populate()
+                    self.assertTrue(tree.pruned)
+                    imported = Tree(sequent, source={k: str(v) for k, v in tree.items()})
+                    Settings()["Sequent Rules"]["Rv"] = "Add"
+                    imported.refresh()
+                    populated = Tree(sequent)
+                    populated.populate()
+                    self.assertGreater(len(populated), len(tree))
+                    self.assertEqual(populated, imported)
+        finally:
+            Settings().dict["Reflexivity"] = reflexivity
+
+    def test_shared_trees_are_rebuilt(self):
+        tree = Tree(self.sequent, factorise=True, share=True)
+        tree.populate()
+        change_multiple(rule="", mode="NonInvertible")
+        tree.refresh()
+        populated = Tree(self.sequent)
+        populated.populate()
+        self.assertEqual(dict(populated), tree.unfold())
+
+
+class TestCheckpoints(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequents = ["((A or B) or C), D |~ (E and F), G",
+                "A, (A or B) |~ (A and C)",
+                "(A and B), (C or D) |~ (E implies (F and G))"]
+
+    def setUp(self) -> None:
+        self.reflexivity = Settings()["Reflexivity"]
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, "checkpoint.json")
+
+    def tearDown(self) -> None:
+        Settings().dict["Reflexivity"] = self.reflexivity
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+        shutil.rmtree(self.directory)
+
+    def interrupt(self, tree, after):
+        """Populates tree, interrupted while adding its after-th child
+        (i.e. half way through a decomposition)."""
+        set_item = Tree.__setitem__
+        calls = []
+
+        def interrupted(tree, key, sequent):
+            calls.append(key)
+            if len(calls) == after:
+                raise KeyboardInterrupt
+            set_item(tree, key, sequent)
+        with patch.object(Tree, "__setitem__", interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                tree.populate(checkpoint=self.checkpoint, interval=0)
+
+    def test_resumed_trees_match_populate(self):
+        change_multiple(rule="", mode="NonInvertible")
+        for reflexivity in (True, False):
+            Settings().dict["Reflexivity"] = reflexivity
+            for sequent in self.sequents:
+                for options in ({}, {"factorise": True, "share": True}):
+                    full = Tree(sequent, **options)
+                    full.populate()
+                    for after in (1, 2, 5, 9):
+                        with self.subTest(sequent=sequent, options=options,
+                                          reflexivity=reflexivity, after=after):
+                            self.interrupt(Tree(sequent, **options), after)
+                            resumed = resume(self.checkpoint)
+                            resumed.populate(checkpoint=self.checkpoint)
+                            self.assertEqual(list(full.locations()),
+                                             list(resumed.locations()))
+                            self.assertEqual(full.pruned, resumed.pruned)
+                            self.assertEqual(full.explosions, resumed.explosions)
+                            self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resuming_with_other_settings_is_refused(self):
+        change_multiple(rule="", mode="NonInvertible")
+        self.interrupt(Tree(self.sequents[1]), 2)
+        change_multiple(rule="", mode="Invertible")
+        with self.assertRaises(ValueError):
+            resume(self.checkpoint)
+
+
 class TestKeys(unittest.TestCase):
 
     def test_key_attributes(self):
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+
+from Controllers import Rules
+from Controllers.Settings import Settings
+from Objects.Trees import Tree
+from Objects.Vetting import BloomFilter, Vetter
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=100)
+        for i in range(100):
+            bloom.add(i)
+        for i in range(100):
+            self.assertIn(i, bloom)
+
+    def test_few_false_positives(self):
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        for i in range(100):
+            bloom.add(i)
+        false_positives = len([i for i in range(100, 10100) if i in bloom])
+        self.assertLess(false_positives, 500)
+
+
+class TestVetter(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+
+    def setUp(self) -> None:
+        file, self.path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(file, "w") as file:
+            json.dump({"Accepted": ["A |~ C"], "Rejected": ["A |~ B"]}, file)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def test_veto_only_rejects_rejected_atoms(self):
+        for bloom in (True, False):
+            vetter = Vetter(self.path, bloom=bloom)
+            self.assertTrue(vetter.veto(*sequent("A |~ B")))
+            self.assertFalse(vetter.veto(*sequent("A |~ C")))
+            self.assertFalse(vetter.veto(*sequent("A |~ (B and B)")))
+
+    def test_tree_prunes_rejected_atoms(self):
+        Rules.change_multiple("", "Invertible")
+        vetter = Vetter(self.path)
+        tree = Tree(sequent("A |~ (B and (C or D))"), vetoes=[vetter.veto])
+        tree.populate()
+        self.assertEqual({"0000": sequent("A |~ (B and (C or D))")}, dict(tree))
+        self.assertEqual(2, tree.pruned)
+
+    def test_cognates_with_rejected_atoms_are_never_built(self):
+        Rules.change_multiple("", "NonInvertible")
+        vetter = Vetter(self.path)
+        for string in ("A |~ (B and (C or D))", "A, (B implies (C and D)) |~ B, C"):
+            with self.subTest(sequent=string):
+                full = Tree(sequent(string))
+                full.populate()
+                dropped = [key[:-1] for key, child in full.items()
+                           if child == sequent("A |~ B")]
+                self.assertTrue(dropped)
+                tree = Tree(sequent(string), vetoes=[vetter.veto])
+                tree.populate()
+                self.assertEqual({key: child for key, child in full.items()
+                                  if not key.startswith(tuple(dropped))}, dict(tree))
+
+    def test_verdicts_are_saved(self):
+        vetter = Vetter(self.path)
+        vetter.reject(sequent("A |~ C"))
+        vetter.accept(sequent("A |~ B"))
+        vetter.save()
+        vetter = Vetter(self.path)
+        self.assertTrue(vetter.veto(*sequent("A |~ C")))
+        self.assertFalse(vetter.veto(*sequent("A |~ B")))
+
+
+if __name__ == '__main__':
+    unittest.main()
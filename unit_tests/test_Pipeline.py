@@ -0,0 +1,86 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Controllers.ImportExport import Export
+from Controllers.Pipeline import Pipeline
+from Controllers.Settings import Settings
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+class TestPipeline(unittest.TestCase):
+    sequents = ["A, (A or B) |~ (A and C)",
+                "(A and B), (C or D) |~ (E implies F)",
+                "A |~ (not B)",
+                "A, (A or B) |~ (A and C)",
+                "((A or B) or C), D |~ (E and F), G"]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, "input.txt")
+        self.runs = os.path.join(self.directory, "runs.json")
+        self.atoms = os.path.join(self.directory, "atoms.json")
+        with open(self.input, "w") as file:
+            file.write("\n".join(self.sequents))
+        with open(self.atoms, "w") as file:
+            file.write('["Z |~ Z"]')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_matches_exporting_the_whole_forest(self):
+        forest = []
+        for line in self.sequents:
+            tree = Tree(String(line).to_sequent(), factorise=True, share=True)
+            tree.populate()
+            forest.append(tree)
+        expected = os.path.join(self.directory, "expected.json")
+        Export(forest).to_runs(expected)
+        written = Pipeline(self.input, self.runs, self.atoms, workers=2,
+                           queue_size=1, cache=False).run()
+        self.assertEqual(4, written)
+        with open(expected) as file, open(self.runs) as runs:
+            self.assertEqual(file.read(), runs.read())
+        atoms = {str(s) for tree in forest for s in tree.values() if s.complexity == 0}
+        with open(self.atoms) as file:
+            self.assertEqual(atoms | {"Z |~ Z"}, set(json.load(file)))
+
+    def test_sequents_over_budget_are_skipped(self):
+        with patch.dict(Settings().dict, {"Node Budget": 5}):
+            pipeline = Pipeline(self.input, self.runs, self.atoms, workers=1,
+                                cache=False)
+            written = pipeline.run()
+        with open(self.runs) as file:
+            runs = json.load(file)
+        self.assertEqual(set(runs), set(self.sequents) - set(pipeline.skipped))
+        self.assertEqual(len(runs), written)
+        self.assertTrue(pipeline.skipped)
+
+    def test_errors_stop_the_pipeline(self):
+        with open(self.input, "a") as file:
+            file.write("\n(A and |~ B")
+        pipeline = Pipeline(self.input, self.runs, self.atoms, workers=1,
+                            cache=False)
+        with self.assertRaises(ValueError):
+            pipeline.run()
+        with open(self.atoms) as file:
+            self.assertEqual(["Z |~ Z"], json.load(file))
+        self.assertEqual(["atoms.json", "input.txt"], sorted(os.listdir(self.directory)))
+
+    def test_errors_keep_the_previous_runs_file(self):
+        with open(self.runs, "w") as file:
+            file.write("{}")
+        with open(self.input, "a") as file:
+            file.write("\n(A and |~ B")
+        with self.assertRaises(ValueError):
+            Pipeline(self.input, self.runs, self.atoms, workers=1, cache=False).run()
+        with open(self.runs) as file:
+            self.assertEqual("{}", file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
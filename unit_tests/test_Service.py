@@ -0,0 +1,132 @@
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from Controllers.Caches import Cache
+from Controllers.Service import Engine, Server
+from Objects.Counts import TreeCounter
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+class TestService(unittest.TestCase):
+    sequents = ["(A and B), (C or D) |~ (E implies F)", "A |~ (not B)"]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.server = Server(("127.0.0.1", 0), Engine(Cache(self.directory), processes=2), workers=2)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def post(self, endpoint, body):
+        request = Request(f"http://127.0.0.1:{self.server.server_port}/{endpoint}",
+                          data=json.dumps(body).encode(), method="POST")
+        with urlopen(request) as response:
+            return json.loads(response.read())
+
+    def test_decompose_batch(self):
+        results = self.post("decompose", {"sequents": self.sequents})["results"]
+        for string, result in zip(self.sequents, results):
+            tree = Tree(string)
+            tree.populate()
+            self.assertEqual({k: str(v) for k, v in tree.items()}, result["tree"])
+
+    def test_count_and_derive(self):
+        count = self.post("count", {"sequents": self.sequents[:1]})["results"][0]
+        expected = TreeCounter().count(String(self.sequents[0]).to_sequent())
+        self.assertEqual(expected._asdict(), {k: count[k] for k in expected._fields})
+        derived = self.post("derive", {"sequents": ["A |~ A"]})["results"][0]
+        self.assertEqual("A |~ A", derived["sequent"])
+        self.assertIn("is_derivable", derived)
+
+    def test_caches_stay_warm(self):
+        self.post("count", {"sequents": self.sequents})
+        self.post("decompose", {"sequents": self.sequents})
+        self.post("decompose", {"sequents": self.sequents})
+        with urlopen(f"http://127.0.0.1:{self.server.server_port}/status") as response:
+            status = json.loads(response.read())
+        self.assertEqual(3, status["requests"])
+        self.assertEqual(2, status["cache_misses"])
+        self.assertEqual(2, status["memo_hits"])
+        self.assertGreater(status["counted"], 0)
+
+    def test_memo_is_bounded(self):
+        self.server.engine.memo_size = 1
+        self.post("decompose", {"sequents": self.sequents + self.sequents[:1]})
+        self.assertEqual([str(String(self.sequents[0]).to_sequent())],
+                         list(self.server.engine.memo))
+        self.assertEqual(0, self.server.engine.memo_hits)
+        self.assertEqual(1, self.server.engine.cache.hits)
+
+    def test_long_counts_hold_up_no_other_request(self):
+        started, release = threading.Event(), threading.Event()
+        count = TreeCounter.count
+
+        def slow(counter, sequent):
+            started.set()
+            release.wait(10)
+            return count(counter, sequent)
+
+        with patch.object(TreeCounter, "count", autospec=True, side_effect=slow):
+            counting = threading.Thread(target=self.post,
+                                        args=("count", {"sequents": self.sequents[:1]}))
+            counting.start()
+            self.assertTrue(started.wait(10))
+            try:
+                with urlopen(f"http://127.0.0.1:{self.server.server_port}/status",
+                             timeout=5) as response:
+                    self.assertEqual(0, json.loads(response.read())["requests"])
+                self.assertTrue(self.post("derive", {"sequents": ["A |~ A"]})["results"])
+            finally:
+                release.set()
+                counting.join()
+
+    def test_bad_requests(self):
+        with self.assertRaises(HTTPError) as error:
+            self.post("decompose", {"sequents": ["not a sequent"]})
+        self.assertEqual(400, error.exception.code)
+        with self.assertRaises(HTTPError) as error:
+            self.post("explode", {"sequents": []})
+        self.assertEqual(404, error.exception.code)
+
+    def test_concurrent_requests(self):
+        requests = [("decompose", self.sequents), ("count", self.sequents),
+                    ("derive", ["A |~ A"])] * 8
+        with ThreadPoolExecutor(8) as pool:
+            answers = list(pool.map(lambda request: self.post(
+                request[0], {"sequents": request[1]}), requests))
+        for (endpoint, sequents), answer in zip(requests, answers):
+            self.assertEqual(sequents, [result["sequent"] for result in answer["results"]])
+        tree = Tree(self.sequents[0])
+        tree.populate()
+        self.assertEqual({k: str(v) for k, v in tree.items()},
+                         answers[0]["results"][0]["tree"])
+        with urlopen(f"http://127.0.0.1:{self.server.server_port}/status") as response:
+            status = json.loads(response.read())
+        self.assertEqual(len(requests), status["requests"])
+        self.assertEqual(16, status["memo_hits"] + status["cache_hits"]
+                         + status["cache_misses"])
+
+    def test_unexpected_errors_are_answered(self):
+        with patch.object(Engine, "count", side_effect=RuntimeError("boom")), \
+                patch.object(self.server, "handle_error"):
+            with self.assertRaises(HTTPError) as error:
+                self.post("count", {"sequents": self.sequents})
+        self.assertEqual(500, error.exception.code)
+        self.assertEqual("RuntimeError: boom", json.loads(error.exception.read())["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Controllers import Shards
+from Controllers.Pipeline import Pipeline, shard_of
+from Controllers.Settings import Settings
+
+
+class TestShards(unittest.TestCase):
+    sequents = ["A, (A or B) |~ (A and C)",
+                "(A and B), (C or D) |~ (E implies F)",
+                "A |~ (not B)",
+                "A, (A or B) |~ (A and C)",
+                "((A or B) or C), D |~ (E and F), G",
+                "(A implies B) |~ (B or C)"]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, "input.txt")
+        with open(self.input, "w") as file:
+            file.write("\n".join(self.sequents))
+        self.patch = patch.object(Shards, "_shards_dir", os.path.join(self.directory, "Shards"))
+        self.patch.start()
+
+    def tearDown(self) -> None:
+        self.patch.stop()
+        shutil.rmtree(self.directory)
+
+    def path(self, name, content=None):
+        path = os.path.join(self.directory, name)
+        if content is not None:
+            with open(path, "w") as file:
+                file.write(content)
+        return path
+
+    def read(self, name):
+        with open(self.path(name)) as file:
+            return file.read()
+
+    def test_merge_matches_single_run(self):
+        atoms = self.path("atoms.json", '["Z |~ Z"]')
+        Pipeline(self.input, self.path("runs.json"), atoms, workers=1, cache=False).run()
+        merged_atoms = self.path("merged-atoms.json", '["Z |~ Z"]')
+        for index in (2, 0, 1):
+            Shards.decompose_shard(self.input, index, 3, "test", workers=1, cache=False)
+        trees = Shards.merge("test", self.path("merged.json"), merged_atoms)
+        self.assertEqual(5, trees)
+        self.assertEqual(self.read("runs.json"), self.read("merged.json"))
+        self.assertEqual(self.read("atoms.json"), self.read("merged-atoms.json"))
+        self.assertEqual(sorted(json.loads(self.read("atoms.json"))),
+                         json.loads(self.read("atoms.json")))
+        self.assertFalse(os.path.exists(self.path("merged.json.tmp")))
+
+    def test_shards_are_stable(self):
+        self.assertEqual([shard_of(sequent, 3) for sequent in self.sequents],
+                         [shard_of(sequent, 3) for sequent in self.sequents])
+        self.assertEqual(shard_of(self.sequents[0], 3), shard_of(self.sequents[3], 3))
+        self.assertEqual(7386605376936342967 % 7, shard_of("A |~ A", 7))
+
+    def test_missing_shards_are_refused(self):
+        Shards.decompose_shard(self.input, 0, 2, "test", workers=1, cache=False)
+        atoms = self.path("atoms.json", "[]")
+        with self.assertRaises(ValueError):
+            Shards.merge("test", self.path("merged.json"), atoms)
+        self.assertEqual("[]", self.read("atoms.json"))
+
+    def test_shards_with_different_settings_are_refused(self):
+        Shards.decompose_shard(self.input, 0, 2, "test", workers=1, cache=False)
+        with patch.dict(Settings().dict, {"Reflexivity": not Settings()["Reflexivity"]}):
+            Shards.decompose_shard(self.input, 1, 2, "test", workers=1, cache=False)
+        with self.assertRaises(ValueError):
+            Shards.merge("test", self.path("merged.json"), self.path("atoms.json", "[]"))
+
+    def test_shards_of_different_inputs_are_refused(self):
+        Shards.decompose_shard(self.input, 0, 2, "test", workers=1, cache=False)
+        other = self.path("other.txt", "\n".join(reversed(self.sequents)))
+        Shards.decompose_shard(other, 1, 2, "test", workers=1, cache=False)
+        with self.assertRaises(ValueError):
+            Shards.merge("test", self.path("merged.json"), self.path("atoms.json", "[]"))
+        self.assertFalse(os.path.exists(self.path("merged.json")))
+
+    def test_invalid_shard(self):
+        with self.assertRaises(ValueError):
+            Shards.decompose_shard(self.input, 3, 3, "test", cache=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
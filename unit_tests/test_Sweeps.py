@@ -0,0 +1,47 @@
+import unittest
+
+from Controllers.Settings import Settings
+from Controllers.Sweeps import Sweep, label
+from Objects.Trees import Tree
+from Propositions.Converters import String
+
+
+def sequent(string):
+    return String(string).to_sequent()
+
+
+class TestSweep(unittest.TestCase):
+    rules = {k: v for k, v in Settings()["Sequent Rules"].items()}
+    sequents = [sequent("(A and B), (C or D) |~ (E implies F)"),
+                sequent("(A or B), C |~ (A and C)"),
+                sequent("A |~ (not B)")]
+
+    def tearDown(self) -> None:
+        for k, v in self.rules.items():
+            Settings()["Sequent Rules"][k] = v
+
+    def test_atoms_match_populated_trees(self):
+        sweep = Sweep(self.sequents)
+        results = sweep.run()
+        self.assertEqual(64, len(results))
+        self.assertEqual(self.rules, Settings()["Sequent Rules"])
+        for configuration in list(sweep.configurations())[::9]:
+            Settings()["Sequent Rules"].update(configuration)
+            atoms = set()
+            for root in self.sequents:
+                tree = Tree(str(root))
+                tree.populate()
+                atoms.update(str(s) for s in tree.values() if not s.complexity)
+            self.assertEqual(atoms, results[label(configuration)])
+
+    def test_subtrees_are_shared_across_configurations(self):
+        sweep = Sweep(self.sequents)
+        sweep.run()
+        self.assertGreater(sweep.hits, 0)
+        # "A |~ (not B)" has no Add/Mult connective: decomposed once
+        self.assertEqual(1, len([key for key in sweep.memo
+                                 if key[0] == self.sequents[2]]))
+
+
+if __name__ == '__main__':
+    unittest.main()